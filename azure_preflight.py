@@ -1,9 +1,24 @@
 # azure_preflight.py
-import shutil, subprocess
+import os, shutil, subprocess, time
+from pathlib import Path
 
 class AzurePreflightError(Exception): pass
 
-def ensure_azure_ready():
+# A passing preflight is remembered per user for this long; each `az` call costs a second or two of startup.
+AZURE_PREFLIGHT_TTL_SECONDS = float(os.getenv("AZURE_PREFLIGHT_TTL_SECONDS", "3600"))
+
+def _ready_marker() -> Path:
+    return Path.home() / ".cache" / "cloud_pricing" / "az_ready"
+
+def ensure_azure_ready(force: bool = False):
+    marker = _ready_marker()
+    if not force:
+        try:
+            if time.time() - marker.stat().st_mtime < AZURE_PREFLIGHT_TTL_SECONDS:
+                return
+        except OSError:
+            pass
+
     az = shutil.which("az") or shutil.which("az.cmd") or shutil.which("az.exe")
     if not az:
         raise AzurePreflightError("Azure CLI not found. Install https://aka.ms/azcli and run 'az login'.")
@@ -16,3 +31,9 @@ def ensure_azure_ready():
                        capture_output=True, text=True)
     if p.returncode != 0 or p.stdout.strip().lower() != "registered":
         raise AzurePreflightError("Provider Microsoft.Compute not registered. Run: az provider register -n Microsoft.Compute")
+
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError:
+        pass  # caching is best-effort
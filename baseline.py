@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, MISSING
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Mapping, Sequence, Union
+import importlib.util
 import json
 import os
 
+try:
+    import orjson  # type: ignore  # optional: faster override parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 try:
     import click  # only required for interactive prompt
 except Exception:
@@ -15,12 +23,13 @@ except Exception:
 try:
     from pricing import (
         price_ec2_ondemand,
+        build_price_index,
         EBS_GP3_GB_MONTH as _EBS_GP3_DEFAULT,
         S3_STD_GB_MONTH as _S3_STD_DEFAULT,
     )
 except Exception:
     # Fallbacks if pricing module isn't available for any reason
-    price_ec2_ondemand = None  # type: ignore
+    price_ec2_ondemand = build_price_index = None  # type: ignore
     _EBS_GP3_DEFAULT = 0.08
     _S3_STD_DEFAULT = 0.023
 
@@ -29,20 +38,73 @@ except Exception:
 
 # Built-in conservative defaults (USD)
 # You can override via ENV or prices/aws_vpc_baseline.json
-_DEFAULT_RATES = {
-    "tgw_attachment_hourly": float(os.getenv("TGW_ATTACHMENT_HOURLY", "0.06")),  # $/attachment-hour
-    "tgw_data_gb":           float(os.getenv("TGW_DATA_GB", "0.02")),            # $/GB
-    "vpce_if_hourly":        float(os.getenv("VPCE_IF_HOURLY", "0.01")),         # $/endpoint-hour
-    "vpce_data_gb":          float(os.getenv("VPCE_DATA_GB", "0.01")),           # $/GB
+# (rate key, env var, default); env is read per resolve_rates call
+_RATE_ENV = (
+    ("tgw_attachment_hourly", "TGW_ATTACHMENT_HOURLY", "0.06"),  # $/attachment-hour
+    ("tgw_data_gb",           "TGW_DATA_GB",           "0.02"),  # $/GB
+    ("vpce_if_hourly",        "VPCE_IF_HOURLY",        "0.01"),  # $/endpoint-hour
+    ("vpce_data_gb",          "VPCE_DATA_GB",          "0.01"),  # $/GB
     # Added: storage pricing reused for GitRunner OS disk and TF backend S3
-    "ebs_gp3_gb_month":      float(os.getenv("EBS_GP3_GB_MONTH", str(_EBS_GP3_DEFAULT))),  # $/GB-month
-    "s3_std_gb_month":       float(os.getenv("S3_STD_GB_MONTH",  str(_S3_STD_DEFAULT))),   # $/GB-month
-}
+    ("ebs_gp3_gb_month",      "EBS_GP3_GB_MONTH",      str(_EBS_GP3_DEFAULT)),  # $/GB-month
+    ("s3_std_gb_month",       "S3_STD_GB_MONTH",       str(_S3_STD_DEFAULT)),   # $/GB-month
+)
+
+
+def _env_snapshot() -> Tuple[Optional[str], ...]:
+    return tuple(os.environ.get(var) for _, var, _ in _RATE_ENV)
+
+
+def _env_rates(env: Optional[Tuple[Optional[str], ...]] = None) -> Dict[str, float]:
+    if env is None:
+        env = _env_snapshot()
+    return {key: float(val if val is not None else default)
+            for (key, _, default), val in zip(_RATE_ENV, env)}
+
+
+_DEFAULT_RATES = _env_rates()  # import-time snapshot, kept for callers that read it
+
+def _parse_hourly_override(v: Optional[str]) -> Optional[float]:
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except Exception:
+        return 0.0
+
+
+# GITRUNNER_HOURLY skips the pricing lookup entirely (read once at import)
+_GITRUNNER_HOURLY_OVERRIDE: Optional[float] = _parse_hourly_override(os.getenv("GITRUNNER_HOURLY"))
+
+
+# Probed once: pricing's boto3 path calls sys.exit when boto3 is missing, so don't go there without it
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ValueError:  # already imported without a __spec__
+        return True
+
+
+_BOTO3_AVAILABLE = _has_module("boto3")
+
+
+@lru_cache(maxsize=512)
+def _cached_ec2_ondemand(instance_type: str, region: str) -> float:
+    """Linux On-Demand hourly for the GitRunner; 0.0 when it can't be priced (failures are cached too)."""
+    try:
+        # A fresh local price index (prices/aws_ec2_index_<region>.json) avoids the API across runs
+        usd = build_price_index(region, "Linux", fetch=False).get(instance_type) if build_price_index else None
+        if usd is None and price_ec2_ondemand is not None and _BOTO3_AVAILABLE:
+            usd = price_ec2_ondemand(instance_type, region, os_name="Linux")
+        return float(usd) if usd is not None else 0.0
+    except Exception:
+        # botocore ClientError / NoCredentialsError / endpoint errors, or an unreadable index
+        return 0.0
+
 
 HOURS_DEFAULT = 730.0  # default hours/month across the app
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaselineInputs:
     region: str
     tgw_attachments: int
@@ -58,8 +120,21 @@ class BaselineInputs:
     gitrunner_os_gb: float = 256.0
     tf_backend_s3_gb: float = 1.0
 
-
-@dataclass(frozen=True)
+    def __post_init__(self) -> None:
+        # Clamp once so compute_baseline is plain arithmetic; values keep the caller's type
+        _set = object.__setattr__
+        _set(self, "tgw_attachments", max(0, self.tgw_attachments))
+        _set(self, "tgw_data_gb", max(0.0, self.tgw_data_gb))
+        _set(self, "vpce_base_per_az", max(0, self.vpce_base_per_az))
+        _set(self, "vpce_extra_per_az", max(0, self.vpce_extra_per_az))
+        _set(self, "vpce_azs", max(1, self.vpce_azs))
+        _set(self, "vpce_data_gb", max(0.0, self.vpce_data_gb))
+        _set(self, "gitrunner_count", max(0, self.gitrunner_count))
+        _set(self, "gitrunner_os_gb", max(0.0, self.gitrunner_os_gb))
+        _set(self, "tf_backend_s3_gb", max(0.0, self.tf_backend_s3_gb))
+
+
+@dataclass(frozen=True, slots=True)
 class BaselineRates:
     tgw_attachment_hourly: float
     tgw_data_gb: float
@@ -71,6 +146,39 @@ class BaselineRates:
 
 # --------------------------- Rates & I/O ---------------------------
 
+_RATES_JSON = Path("prices/aws_vpc_baseline.json")
+
+
+@lru_cache(maxsize=4)
+def _load_all_rates(path: str, mtime_ns: int) -> Dict[str, Optional[Dict[str, float]]]:
+    """
+    Parse the override file once per (path, mtime). Values are coerced to float
+    up front and every region is also reachable under its lowercased key.
+    A region whose values don't parse maps to None.
+    """
+    data = _loads(Path(path).read_bytes())
+    out: Dict[str, Optional[Dict[str, float]]] = {}
+    if not isinstance(data, dict):
+        return out
+    for region, region_rates in data.items():
+        rates: Optional[Dict[str, float]] = None
+        if isinstance(region_rates, dict):
+            try:
+                rates = {k: float(v) for k, v in region_rates.items()}
+            except Exception:
+                rates = None
+        out[region] = rates
+    for region in list(out):
+        out.setdefault(region.lower(), out[region])
+    return out
+
+
+def _invalidate() -> None:
+    """Drop the parsed override file and resolved rates (mtime/env changes already do this on their own)."""
+    _load_all_rates.cache_clear()
+    _resolve_rates_cached.cache_clear()
+
+
 def _load_rates_from_json(region: str) -> Optional[Dict[str, float]]:
     """
     Optional per-region override JSON: prices/aws_vpc_baseline.json
@@ -83,22 +191,24 @@ def _load_rates_from_json(region: str) -> Optional[Dict[str, float]]:
       }
     }
     """
-    p = Path("prices/aws_vpc_baseline.json")
-    if not p.exists():
-        return None
+    p = _RATES_JSON
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
-        region_rates = data.get(region) or data.get(region.strip().lower())
-        if isinstance(region_rates, dict):
-            return {k: float(v) for k, v in region_rates.items()}
+        st = p.stat()
+    except OSError:
         return None
+    try:
+        data = _load_all_rates(os.path.abspath(p), st.st_mtime_ns)
     except Exception:
         return None
+    region_rates = data.get(region) or data.get(region.strip().lower())
+    return dict(region_rates) if region_rates else None
 
 
-def resolve_rates(region: str) -> BaselineRates:
-    # Priority: JSON override (per region) -> ENV -> built-ins
-    merged = dict(_DEFAULT_RATES)
+@lru_cache(maxsize=64)
+def _resolve_rates_cached(region: str, mtime_ns: Optional[int],
+                          env: Tuple[Optional[str], ...]) -> BaselineRates:
+    # mtime_ns only keys the cache; _load_rates_from_json re-stats on a miss
+    merged = _env_rates(env)
     j = _load_rates_from_json(region) or {}
     merged.update(j)
     return BaselineRates(
@@ -111,170 +221,337 @@ def resolve_rates(region: str) -> BaselineRates:
     )
 
 
+def resolve_rates(region: str) -> BaselineRates:
+    # Priority: JSON override (per region) -> ENV -> built-ins
+    # Cached per (region, override mtime, env); hits return the same frozen instance.
+    try:
+        mtime_ns: Optional[int] = _RATES_JSON.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _resolve_rates_cached(region, mtime_ns, _env_snapshot())
+
+
 # --------------------------- Computation ---------------------------
 
-def compute_baseline(inputs: BaselineInputs, rates: BaselineRates) -> Tuple[List[dict], float]:
+_ROW_FIELDS = ("component", "detail", "qty", "unit", "rate", "monthly_usd", "region", "notes")
+
+
+def _mkrow(component, detail, qty, unit, rate, monthly, region, notes="") -> dict:
+    return dict(zip(_ROW_FIELDS, (component, detail, qty, unit, rate, monthly, region, notes)))
+
+
+def compute_baseline(inputs: BaselineInputs, rates: BaselineRates,
+                     include_zero_rows: bool = False) -> Tuple[List[dict], float]:
     """
     Returns (rows, total_monthly_usd).
-    Rows are itemized for CSV/Excel.
+    Rows are itemized for CSV/Excel; rate and monthly_usd stay numeric
+    (write_baseline_csv formats them as %.5f / %.2f).
+    Line items with zero quantity and zero cost are left out unless include_zero_rows;
+    the TOTAL row is always present.
     """
     hpmo = float(inputs.hours_per_month)
+    hours_note = f"{hpmo:g} hours assumed"
 
     # TGW
-    tgw_attach_monthly = max(0, inputs.tgw_attachments) * rates.tgw_attachment_hourly * hpmo
-    tgw_data_monthly = max(0.0, inputs.tgw_data_gb) * rates.tgw_data_gb
+    tgw_attach_monthly = inputs.tgw_attachments * rates.tgw_attachment_hourly * hpmo
+    tgw_data_monthly = inputs.tgw_data_gb * rates.tgw_data_gb
 
     # Interface Endpoints (PrivateLink) - per-AZ counts
-    total_endpoints = (max(0, inputs.vpce_base_per_az) + max(0, inputs.vpce_extra_per_az)) * max(1, inputs.vpce_azs)
+    total_endpoints = (inputs.vpce_base_per_az + inputs.vpce_extra_per_az) * inputs.vpce_azs
     vpce_attach_monthly = total_endpoints * rates.vpce_if_hourly * hpmo
-    vpce_data_monthly = max(0.0, inputs.vpce_data_gb) * rates.vpce_data_gb
-
-    rows = [
-        {
-            "component": "TGW Attachment",
-            "detail": "attachments",
-            "qty": inputs.tgw_attachments,
-            "unit": "attachment-hour",
-            "rate": f"{rates.tgw_attachment_hourly:.5f}",
-            "monthly_usd": f"{tgw_attach_monthly:.2f}",
-            "region": inputs.region,
-            "notes": f"{hpmo:g} hours assumed",
-        },
-        {
-            "component": "TGW Data",
-            "detail": "data processed",
-            "qty": inputs.tgw_data_gb,
-            "unit": "GB",
-            "rate": f"{rates.tgw_data_gb:.5f}",
-            "monthly_usd": f"{tgw_data_monthly:.2f}",
-            "region": inputs.region,
-            "notes": "",
-        },
-        {
-            "component": "Interface Endpoint",
-            "detail": "endpoints x AZs",
-            "qty": total_endpoints,
-            "unit": "endpoint-hour",
-            "rate": f"{rates.vpce_if_hourly:.5f}",
-            "monthly_usd": f"{vpce_attach_monthly:.2f}",
-            "region": inputs.region,
-            "notes": f"{hpmo:g} hours assumed",
-        },
-        {
-            "component": "Interface Endpoint Data",
-            "detail": "data processed",
-            "qty": inputs.vpce_data_gb,
-            "unit": "GB",
-            "rate": f"{rates.vpce_data_gb:.5f}",
-            "monthly_usd": f"{vpce_data_monthly:.2f}",
-            "region": inputs.region,
-            "notes": "",
-        },
+    vpce_data_monthly = inputs.vpce_data_gb * rates.vpce_data_gb
+    total = tgw_attach_monthly + tgw_data_monthly + vpce_attach_monthly + vpce_data_monthly
+
+    # (component, detail, qty, unit, rate, monthly, notes)
+    items: List[tuple] = [
+        ("TGW Attachment", "attachments", inputs.tgw_attachments, "attachment-hour",
+         rates.tgw_attachment_hourly, tgw_attach_monthly, hours_note),
+        ("TGW Data", "data processed", inputs.tgw_data_gb, "GB",
+         rates.tgw_data_gb, tgw_data_monthly, ""),
+        ("Interface Endpoint", "endpoints x AZs", total_endpoints, "endpoint-hour",
+         rates.vpce_if_hourly, vpce_attach_monthly, hours_note),
+        ("Interface Endpoint Data", "data processed", inputs.vpce_data_gb, "GB",
+         rates.vpce_data_gb, vpce_data_monthly, ""),
     ]
     # GitRunner EC2 compute (On-Demand)
     if inputs.gitrunner_count > 0:
         # Prefer explicit env override to avoid requiring network/boto3 in many workflows
-        gr_hourly_env = os.getenv("GITRUNNER_HOURLY")
-        gr_hourly: float = 0.0
-        if gr_hourly_env is not None:
-            try:
-                gr_hourly = float(gr_hourly_env)
-            except Exception:
-                gr_hourly = 0.0
-        elif price_ec2_ondemand is not None:
-            try:
-                p = price_ec2_ondemand(inputs.gitrunner_instance_type, inputs.region, os_name="Linux")
-                if p is not None:
-                    gr_hourly = float(p)
-            except BaseException:
-                # Catch BaseException to handle SystemExit from missing boto3 path
-                gr_hourly = 0.0
-
-        gr_compute_monthly = float(inputs.gitrunner_count) * gr_hourly * hpmo
-        rows.append({
-            "component": "GitRunner EC2",
-            "detail": f"{inputs.gitrunner_instance_type} x {inputs.gitrunner_count}",
-            "qty": inputs.gitrunner_count,
-            "unit": "instance-hour",
-            "rate": f"{gr_hourly:.5f}",
-            "monthly_usd": f"{gr_compute_monthly:.2f}",
-            "region": inputs.region,
-            "notes": f"{hpmo:g} hours assumed",
-        })
+        gr_hourly = (_GITRUNNER_HOURLY_OVERRIDE if _GITRUNNER_HOURLY_OVERRIDE is not None
+                     else _cached_ec2_ondemand(inputs.gitrunner_instance_type, inputs.region))
+
+        gr_compute_monthly = inputs.gitrunner_count * gr_hourly * hpmo
+        total += gr_compute_monthly
+        items.append(("GitRunner EC2", f"{inputs.gitrunner_instance_type} x {inputs.gitrunner_count}",
+                      inputs.gitrunner_count, "instance-hour", gr_hourly, gr_compute_monthly, hours_note))
         # GitRunner OS EBS (gp3 assumed)
-        gr_ebs_monthly = float(inputs.gitrunner_count) * max(0.0, inputs.gitrunner_os_gb) * rates.ebs_gp3_gb_month
-        rows.append({
-            "component": "GitRunner EBS (OS)",
-            "detail": f"gp3 {inputs.gitrunner_os_gb:g} GB x {inputs.gitrunner_count}",
-            "qty": inputs.gitrunner_os_gb,
-            "unit": "GB-month",
-            "rate": f"{rates.ebs_gp3_gb_month:.5f}",
-            "monthly_usd": f"{gr_ebs_monthly:.2f}",
-            "region": inputs.region,
-            "notes": "",
-        })
+        gr_ebs_monthly = inputs.gitrunner_count * inputs.gitrunner_os_gb * rates.ebs_gp3_gb_month
+        total += gr_ebs_monthly
+        items.append(("GitRunner EBS (OS)", f"gp3 {inputs.gitrunner_os_gb:g} GB x {inputs.gitrunner_count}",
+                      inputs.gitrunner_os_gb, "GB-month", rates.ebs_gp3_gb_month, gr_ebs_monthly, ""))
 
     # Terraform backend S3 (Standard)
     if inputs.tf_backend_s3_gb > 0.0:
-        tf_s3_monthly = max(0.0, inputs.tf_backend_s3_gb) * rates.s3_std_gb_month
-        rows.append({
-            "component": "Terraform Backend S3",
-            "detail": "Standard storage",
-            "qty": inputs.tf_backend_s3_gb,
-            "unit": "GB-month",
-            "rate": f"{rates.s3_std_gb_month:.5f}",
-            "monthly_usd": f"{tf_s3_monthly:.2f}",
-            "region": inputs.region,
-            "notes": "",
-        })
-    # Sum all rows we've added so far
-    running_total = tgw_attach_monthly + tgw_data_monthly + vpce_attach_monthly + vpce_data_monthly
-    # Add any GitRunner/S3 rows we just appended
-    try:
-        running_total += gr_compute_monthly  # type: ignore[name-defined]
-    except Exception:
-        pass
-    try:
-        running_total += gr_ebs_monthly  # type: ignore[name-defined]
-    except Exception:
-        pass
-    try:
-        running_total += tf_s3_monthly  # type: ignore[name-defined]
-    except Exception:
-        pass
-    total = running_total
-    rows.append({
-        "component": "TOTAL",
-        "detail": "",
-        "qty": "",
-        "unit": "",
-        "rate": "",
-        "monthly_usd": f"{total:.2f}",
-        "region": inputs.region,
-        "notes": "",
-    })
+        tf_s3_monthly = inputs.tf_backend_s3_gb * rates.s3_std_gb_month
+        total += tf_s3_monthly
+        items.append(("Terraform Backend S3", "Standard storage", inputs.tf_backend_s3_gb, "GB-month",
+                      rates.s3_std_gb_month, tf_s3_monthly, ""))
+
+    region = inputs.region
+    rows = [_mkrow(c, d, q, u, r, m, region, n) for c, d, q, u, r, m, n in items
+            if include_zero_rows or q or m]
+    rows.append(_mkrow("TOTAL", "", "", "", "", total, region))
     return rows, total
 
 
+def compute_baselines_parallel(inputs_list: Sequence[BaselineInputs], max_workers: int = 16,
+                               include_zero_rows: bool = False) -> List[Tuple[List[dict], float]]:
+    """
+    compute_baseline for many scenarios, in input order. The GitRunner EC2 prices
+    (the only network-bound part) are looked up once per unique (instance type, region)
+    on a thread pool first; the arithmetic then runs serially.
+    """
+    inputs_list = list(inputs_list)
+    if _GITRUNNER_HOURLY_OVERRIDE is None:
+        keys = list(dict.fromkeys((i.gitrunner_instance_type, i.region)
+                                  for i in inputs_list if i.gitrunner_count > 0))
+        if keys:
+            # First lookup runs alone so the shared pricing client is created before fanning out
+            _cached_ec2_ondemand(*keys[0])
+            rest = keys[1:]
+            if rest:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(rest)))) as ex:
+                    list(ex.map(lambda k: _cached_ec2_ondemand(*k), rest))
+    return [compute_baseline(i, resolve_rates(i.region), include_zero_rows=include_zero_rows)
+            for i in inputs_list]
+
+
+# Batches at least this large go through the numba kernel when numba is installed
+_NUMBA_MIN_ROWS = int(os.getenv("BASELINE_NUMBA_MIN_ROWS", "50000"))
+_KERNEL_RATES = ("tgw_attachment_hourly", "tgw_data_gb", "vpce_if_hourly",
+                 "vpce_data_gb", "ebs_gp3_gb_month", "s3_std_gb_month")
+_NUMBA_KERNEL = None  # compiled on first use; False when numba is unavailable
+
+
+def _lazy_numba_kernel():
+    # Optional: pip install numba to fuse the batch arithmetic into one parallel loop.
+    global _NUMBA_KERNEL
+    if _NUMBA_KERNEL is None:
+        try:
+            from numba import njit, prange  # type: ignore
+        except Exception:
+            _NUMBA_KERNEL = False
+            return None
+
+        # No fastmath: results must match compute_baseline to the last bit.
+        @njit(cache=True, parallel=True)
+        def _baseline_lines(att, tgw_gb, endpoints, vpce_gb, gr_count, gr_hourly, gr_os_gb, tf_gb, hpmo,
+                            r_att_h, r_tgw, r_if_h, r_vdata, r_ebs, r_s3, out):
+            for i in prange(att.shape[0]):
+                h = hpmo[i]
+                out[i, 0] = att[i] * r_att_h[i] * h
+                out[i, 2] = endpoints[i] * r_if_h[i] * h
+                out[i, 1] = tgw_gb[i] * r_tgw[i]
+                out[i, 3] = vpce_gb[i] * r_vdata[i]
+                out[i, 4] = gr_count[i] * gr_hourly[i] * h
+                out[i, 5] = gr_count[i] * gr_os_gb[i] * r_ebs[i]
+                out[i, 6] = tf_gb[i] * r_s3[i]
+
+        _NUMBA_KERNEL = _baseline_lines
+    return _NUMBA_KERNEL or None
+
+
+# Column order of compute_baseline_batch's result
+BATCH_COLUMNS = ("tgw_attachment", "tgw_data", "vpce_attachment", "vpce_data",
+                 "gitrunner_ec2", "gitrunner_ebs", "tf_backend_s3")
+
+
+def compute_baseline_batch(inputs: Union[Sequence[BaselineInputs], Mapping[str, object]],
+                           rates: Union[BaselineRates, Sequence[BaselineRates]],
+                           gitrunner_hourly=None):
+    """
+    Vectorized compute_baseline for what-if sweeps (many regions/env counts at once).
+
+    inputs: a sequence of BaselineInputs, or columns keyed by BaselineInputs field name
+            (array-likes or scalars; missing fields take the dataclass defaults).
+    rates:  one BaselineRates for every scenario, or one per scenario.
+    gitrunner_hourly: per-scenario EC2 hourly; resolved like compute_baseline when None.
+
+    Returns an (N, 7) float64 array of monthly USD in BATCH_COLUMNS order; the
+    scenario total is the row sum.
+    """
+    import numpy as np
+
+    if isinstance(inputs, Mapping):
+        cols = dict(inputs)
+    else:
+        seq = list(inputs)
+        cols = {f.name: [getattr(x, f.name) for x in seq] for f in fields(BaselineInputs)}
+        cols["_n"] = len(seq)
+    defaults = {f.name: f.default for f in fields(BaselineInputs)}
+    n = cols.pop("_n", None)
+    if n is None:
+        n = max((len(v) for v in cols.values() if np.ndim(v) == 1), default=1)
+
+    def col(name, lo=None, dtype=float):
+        v = cols.get(name, defaults[name])
+        if v is MISSING:
+            raise ValueError(f"compute_baseline_batch: missing input column '{name}'")
+        a = np.broadcast_to(np.asarray(v, dtype=dtype), (n,))
+        return a if lo is None else np.maximum(a, lo)
+
+    if isinstance(rates, BaselineRates):
+        rate = lambda name: getattr(rates, name)
+    else:
+        rate = lambda name: np.fromiter((getattr(r, name) for r in rates), dtype=float, count=n)
+
+    hpmo = col("hours_per_month")
+    gr_count = col("gitrunner_count", 0.0)
+    if gitrunner_hourly is not None:
+        gr_hourly = np.broadcast_to(np.asarray(gitrunner_hourly, dtype=float), (n,))
+    elif _GITRUNNER_HOURLY_OVERRIDE is not None:
+        gr_hourly = np.full(n, _GITRUNNER_HOURLY_OVERRIDE)
+    else:
+        gr_hourly = np.zeros(n)
+        itypes = col("gitrunner_instance_type", dtype=object)
+        regions = col("region", dtype=object)
+        for i in np.flatnonzero(gr_count > 0):
+            gr_hourly[i] = _cached_ec2_ondemand(itypes[i], regions[i])
+
+    attachments = col("tgw_attachments", 0)
+    endpoints = (col("vpce_base_per_az", 0) + col("vpce_extra_per_az", 0)) * col("vpce_azs", 1)
+    tgw_gb, vpce_gb = col("tgw_data_gb", 0.0), col("vpce_data_gb", 0.0)
+    gr_os_gb, tf_gb = col("gitrunner_os_gb", 0.0), col("tf_backend_s3_gb", 0.0)
+
+    out = np.empty((n, len(BATCH_COLUMNS)))
+    kernel = _lazy_numba_kernel() if n >= _NUMBA_MIN_ROWS else None
+    if kernel is not None:
+        vec = lambda a: np.ascontiguousarray(np.broadcast_to(np.asarray(a, dtype=float), (n,)))
+        kernel(*(vec(a) for a in (attachments, tgw_gb, endpoints, vpce_gb, gr_count, gr_hourly,
+                                  gr_os_gb, tf_gb, hpmo)),
+               *(vec(rate(name)) for name in _KERNEL_RATES), out)
+        return out
+
+    out[:, 0] = attachments * rate("tgw_attachment_hourly") * hpmo
+    out[:, 1] = tgw_gb * rate("tgw_data_gb")
+    out[:, 2] = endpoints * rate("vpce_if_hourly") * hpmo
+    out[:, 3] = vpce_gb * rate("vpce_data_gb")
+    out[:, 4] = gr_count * gr_hourly * hpmo
+    out[:, 5] = gr_count * gr_os_gb * rate("ebs_gp3_gb_month")
+    out[:, 6] = tf_gb * rate("s3_std_gb_month")
+    return out
+
+
 # --------------------------- Writer ---------------------------
 
+_CSV_FORMATS = {"rate": ".5f", "monthly_usd": ".2f"}
+
+
+def _csv_cells(r: dict) -> list:
+    cells = []
+    for k in _ROW_FIELDS:
+        v = r.get(k, "")
+        fmt = _CSV_FORMATS.get(k)
+        if fmt and isinstance(v, (int, float)) and not isinstance(v, bool):
+            v = format(v, fmt)
+        cells.append(v)
+    return cells
+
+
 def write_baseline_csv(run_dir: Path, rows: List[dict]) -> Path:
     run_dir.mkdir(parents=True, exist_ok=True)
     out = run_dir / "baseline.csv"
     import csv
-    fieldnames = ["component", "detail", "qty", "unit", "rate", "monthly_usd", "region", "notes"]
-    with out.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+    fieldnames = _ROW_FIELDS
+    with out.open("w", newline="", encoding="utf-8", buffering=1 << 16) as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(_csv_cells(r) for r in rows)
     return out
 
 
 # --------------------------- Prompt Flow ---------------------------
 
-def prompt_for_inputs() -> BaselineInputs:
+_COUNT_INPUTS = ("tgw_attachments", "vpce_base_per_az", "vpce_extra_per_az", "vpce_azs", "gitrunner_count")
+_SIZE_INPUTS = ("tgw_data_gb", "vpce_data_gb", "hours_per_month", "gitrunner_os_gb", "tf_backend_s3_gb")
+
+
+def _whole_number(name: str, v: object) -> int:
+    try:
+        f = None if isinstance(v, bool) else float(v)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        f = None
+    if f is None or not f.is_integer():
+        raise ValueError(f"Baseline input '{name}' must be a whole number, got {v!r}.")
+    return int(f)
+
+
+def _number(name: str, v: object) -> float:
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return v
+    try:
+        return float(v)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        raise ValueError(f"Baseline input '{name}' must be a number, got {v!r}.") from None
+
+
+def inputs_from_mapping(d: Mapping[str, object]) -> BaselineInputs:
+    """
+    BaselineInputs from a dict using the same defaults as the prompts below;
+    only "region" is required. "environments" derives vpce_base_per_az (8 x envs)
+    when vpce_base_per_az itself isn't given. Counts must be whole numbers;
+    bad keys or values raise ValueError.
     """
+    d = dict(d)
+    envs = d.pop("environments", None)
+    known = {f.name for f in fields(BaselineInputs)}
+    unknown = sorted(set(d) - known)
+    if unknown:
+        raise ValueError(f"Unknown baseline input keys: {', '.join(unknown)}")
+    if not str(d.get("region") or "").strip():
+        raise ValueError("Baseline inputs need a 'region'.")
+    d["region"] = str(d["region"]).strip()
+    for k in _COUNT_INPUTS:
+        if k in d:
+            d[k] = _whole_number(k, d[k])
+    for k in _SIZE_INPUTS:
+        if k in d:
+            d[k] = _number(k, d[k])
+    if envs is not None:
+        envs = _whole_number("environments", envs)
+    d.setdefault("tgw_attachments", 1)
+    d.setdefault("tgw_data_gb", 100.0)
+    d.setdefault("vpce_base_per_az", 8 * max(1, envs if envs is not None else 1))
+    d.setdefault("vpce_extra_per_az", 0)
+    d.setdefault("vpce_azs", 2)
+    d.setdefault("vpce_data_gb", d["tgw_data_gb"])
+    return BaselineInputs(**d)
+
+
+def _load_inputs_file(source: str) -> BaselineInputs:
+    import sys
+    if source == "-":
+        raw = sys.stdin.buffer.read()
+    else:
+        raw = Path(source).read_bytes()
+    if str(source).lower().endswith(".toml"):
+        try:
+            import tomllib  # Python 3.11+
+        except ImportError:
+            raise RuntimeError("TOML baseline inputs need Python 3.11+; use JSON instead.")
+        data = tomllib.loads(raw.decode("utf-8"))
+    else:
+        data = _loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"Baseline inputs in {source} must be a JSON/TOML object.")
+    return inputs_from_mapping(data)
+
+
+def prompt_for_inputs(source: Optional[Path] = None) -> BaselineInputs:
+    """
+    With a source (JSON/TOML file, or "-" for JSON on stdin) or CLOUD_PRICING_INPUTS set,
+    inputs are read from it in one shot with no prompts (see inputs_from_mapping).
+
     Interactive prompts with your requested defaults:
       - tgw_attachments = 1
       - tgw_data_gb = 100
@@ -285,6 +562,9 @@ def prompt_for_inputs() -> BaselineInputs:
       - vpce_azs = 2
       - vpce_data_gb = (copy of tgw_data_gb unless overridden)
     """
+    source = source or os.getenv("CLOUD_PRICING_INPUTS") or None
+    if source:
+        return _load_inputs_file(str(source))
     if click is None:
         raise RuntimeError("Interactive prompts require the 'click' package. Please install click or construct BaselineInputs programmatically.")
     region = click.prompt("AWS region (e.g., us-east-1)", type=str).strip()
@@ -314,15 +594,15 @@ def prompt_for_inputs() -> BaselineInputs:
 
     return BaselineInputs(
         region=region,
-        tgw_attachments=max(0, tgw_attachments),
-        tgw_data_gb=max(0.0, tgw_data_gb),
-        vpce_base_per_az=max(0, vpce_base_per_az),
-        vpce_extra_per_az=max(0, vpce_extra_per_az),
-        vpce_azs=max(1, vpce_azs),
-        vpce_data_gb=max(0.0, vpce_data_gb),
+        tgw_attachments=tgw_attachments,
+        tgw_data_gb=tgw_data_gb,
+        vpce_base_per_az=vpce_base_per_az,
+        vpce_extra_per_az=vpce_extra_per_az,
+        vpce_azs=vpce_azs,
+        vpce_data_gb=vpce_data_gb,
         hours_per_month=HOURS_DEFAULT,
         gitrunner_instance_type=gitrunner_instance_type or "t3.medium",
-        gitrunner_count=max(0, gitrunner_count),
-        gitrunner_os_gb=max(0.0, gitrunner_os_gb),
-        tf_backend_s3_gb=max(0.0, tf_backend_s3_gb),
+        gitrunner_count=gitrunner_count,
+        gitrunner_os_gb=gitrunner_os_gb,
+        tf_backend_s3_gb=tf_backend_s3_gb,
     )
@@ -3,11 +3,12 @@ import csv
 import json
 import sys
 import os
-import datetime
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from glob import glob
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import math
+import itertools
+import bisect
 from decimal import Decimal
 
 # ---------- Cost model defaults (override via env if desired) ----------
@@ -29,30 +30,40 @@ NETWORK_PROFILE_TO_GB = {
     "high":  float(os.getenv("NETWORK_EGRESS_GB_HIGH", "5000")),
 }
 
-def _find_latest_output(patterns=("output/recommend_*.csv", "output/recommend_*.xlsx")) -> Optional[Path]:
+def _find_latest_output(prefix: str = "recommend_", suffixes: Tuple[str, ...] = (".csv", ".xlsx")) -> Optional[Path]:
     """
-    Return the newest file matching the given glob patterns, or None if not found.
+    Return the newest output/<prefix>*<suffix> file, or None if not found.
+    One scandir pass; each DirEntry caches its stat() so every file costs a single syscall.
     """
-    candidates = []
-    for pat in patterns:
-        candidates.extend(glob(pat))
-    if not candidates:
+    best, best_t = None, -1.0
+    try:
+        with os.scandir("output") as it:
+            for e in it:
+                if not (e.name.startswith(prefix) and e.name.endswith(suffixes)) or not e.is_file():
+                    continue
+                t = e.stat().st_mtime
+                if t > best_t:
+                    best, best_t = e.path, t
+    except FileNotFoundError:
         return None
-    newest = max((Path(p) for p in candidates), key=lambda p: p.stat().st_mtime)
-    return newest
+    return Path(best) if best else None
 # ---------- Output helpers ----------
+_OUT_DIR_READY = False
+
 def make_output_path(cmd: str, user_out: Optional[str] = None) -> str:
     """
     Build the output file path.
     - If user provided --out, honor it.
     - Otherwise, place file in ./output/<cmd>_<timestamp>.csv
     """
+    global _OUT_DIR_READY
     if user_out:
         return user_out
     out_dir = Path("output")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    ts = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
-    return str(out_dir / f"{cmd}_{ts}.csv")
+    if not _OUT_DIR_READY:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        _OUT_DIR_READY = True
+    return str(out_dir / f"{cmd}_{time.strftime('%Y%m%d-%H%M%S')}.csv")
 
 # Load environment variables from .env file if present (optional)
 try:
@@ -62,6 +73,8 @@ except Exception:
     pass
 
 def _as_float(x, default=0.0):
+    if isinstance(x, (int, float)):
+        return float(x)  # already numeric (pandas/Excel cells): no string checks
     try:
         if x is None or x == "":
             return default
@@ -70,6 +83,8 @@ def _as_float(x, default=0.0):
         return default
 
 def _as_int(x, default=0):
+    if type(x) is int:
+        return x
     try:
         if x is None or x == "":
             return default
@@ -77,26 +92,55 @@ def _as_int(x, default=0):
     except Exception:
         return default
 
+_TRUE_STRINGS = frozenset({"y", "yes", "true", "1"})
+_FALSE_STRINGS = frozenset({"n", "no", "false", "0"})
+
 def _as_bool(x, default=False):
     if isinstance(x, bool):
         return x
     if x is None:
         return default
     s = str(x).strip().lower()
-    if s in {"y","yes","true","1"}:
+    if s in _TRUE_STRINGS:
         return True
-    if s in {"n","no","false","0"}:
+    if s in _FALSE_STRINGS:
         return False
     return default
 
 # ---------- Lazy imports ----------
+_BOTO3 = None
+
 def _lazy_boto3():
-    try:
-        import boto3  # type: ignore
-        return boto3
-    except ImportError:
-        print("This script requires boto3. Install with: pip install boto3", file=sys.stderr)
-        sys.exit(1)
+    global _BOTO3
+    if _BOTO3 is None:
+        try:
+            import boto3  # type: ignore
+        except ImportError:
+            print("This script requires boto3. Install with: pip install boto3", file=sys.stderr)
+            sys.exit(1)
+        _BOTO3 = boto3
+    return _BOTO3
+
+try:
+    import orjson  # type: ignore  # optional: much faster PriceList parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def _boto_config():
+    """botocore Config with SO_KEEPALIVE on (TCP_NODELAY is botocore's default) and a larger pool."""
+    from botocore.config import Config
+    return Config(tcp_keepalive=True, max_pool_connections=50, connect_timeout=5, read_timeout=30)
+
+# boto3 clients by (service, region); building one resolves credentials and endpoints, so do it once.
+_BOTO_CLIENTS: Dict[Tuple[str, str], object] = {}
+
+def _client(service: str, region: str):
+    key = (service, region)
+    c = _BOTO_CLIENTS.get(key)
+    if c is None:
+        c = _BOTO_CLIENTS[key] = _lazy_boto3().client(service, region_name=region, config=_boto_config())
+    return c
 
 def _lazy_pandas():
     try:
@@ -112,6 +156,7 @@ FAMILY_PREFS = {
     "compute":  ["c7i", "c6i", "c5"],
     "memory":   ["r7i", "r6i", "r5"],
 }
+FAMILY_RANK = {p: {f: i for i, f in enumerate(fs)} for p, fs in FAMILY_PREFS.items()}
 
 def infer_profile(vcpu: int, mem_gib: float) -> str:
     """Basic heuristic from memory-per-vCPU."""
@@ -129,50 +174,41 @@ def fetch_instance_catalog(region: str) -> Dict[str, dict]:
     """
     Return a dict {instanceType -> details} for current-gen x86_64, non-metal in the given region.
     """
-    boto3 = _lazy_boto3()
-    ec2 = boto3.client("ec2", region_name=region)
+    ec2 = _client("ec2", region)
     paginator = ec2.get_paginator("describe_instance_types")
-    page_it = paginator.paginate(Filters=[{"Name": "current-generation", "Values": ["true"]}])
-
-    catalog = {}
-    for page in page_it:
-        for it in page.get("InstanceTypes", []):
-            itype = it["InstanceType"]
-            if itype.endswith(".metal"):
-                continue
-            archs = it.get("ProcessorInfo", {}).get("SupportedArchitectures", [])
-            if "x86_64" not in archs:
-                continue
-            vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus", 0)
-            mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB", 0)
-            if vcpu <= 0 or mem_mib <= 0:
-                continue
-            catalog[itype] = {
-                "instanceType": itype,
-                "vcpu": vcpu,
-                "memory_gib": mem_mib / 1024.0,
-            }
+    # EC2 drops old-gen and non-x86_64 types server-side, so they are never paged down.
+    # Metal is filtered by name below: "bare-metal=false" would also drop sized metal (m7i.metal-24xl).
+    page_it = paginator.paginate(Filters=[
+        {"Name": "current-generation", "Values": ["true"]},
+        {"Name": "processor-info.supported-architecture", "Values": ["x86_64"]},
+    ])
+
+    specs = (
+        (it["InstanceType"], it.get("VCpuInfo", {}).get("DefaultVCpus", 0), it.get("MemoryInfo", {}).get("SizeInMiB", 0))
+        for page in page_it for it in page.get("InstanceTypes", [])
+    )
+    catalog = {
+        itype: {"instanceType": itype, "vcpu": vcpu, "memory_gib": mem_mib / 1024.0}
+        for itype, vcpu, mem_mib in specs
+        if vcpu > 0 and mem_mib > 0 and not itype.endswith(".metal")
+    }
     return catalog
 
-def _family_rank(families: List[str], itype: str) -> int:
-    fam = itype.split(".")[0]
-    try:
-        return families.index(fam)
-    except ValueError:
-        return len(families) + 1
+def _family_rank(rank_map: Dict[str, int], itype: str) -> int:
+    return rank_map.get(itype.partition(".")[0], len(rank_map) + 1)
 
 def pick_instance(catalog: Dict[str, dict], profile: str, need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
     """
     Choose the smallest instance in preferred families that satisfies requirements.
     Falls back to any current-gen x86 if preferred families don't fit.
     """
-    families = FAMILY_PREFS.get(profile, FAMILY_PREFS["balanced"])
+    rank_map = FAMILY_RANK.get(profile, FAMILY_RANK["balanced"])
     candidates = [t for t, info in catalog.items() if info["vcpu"] >= need_vcpu and info["memory_gib"] >= need_mem_gib]
     if not candidates:
         return None
     def sort_key(itype: str) -> Tuple[int, int, float, str]:
         info = catalog[itype]
-        return (_family_rank(families, itype), info["vcpu"], info["memory_gib"], itype)
+        return (_family_rank(rank_map, itype), info["vcpu"], info["memory_gib"], itype)
     candidates.sort(key=sort_key)
     return catalog[candidates[0]]
 
@@ -191,6 +227,26 @@ def _smallest_meeting_mem(catalog: Dict[str, dict], mem_needed: float) -> Option
     fits.sort(key=lambda x: (x["memory_gib"], x["vcpu"], x["instanceType"]))
     return fits[0]
 
+def _smallest_meeting_lookups(catalog: Dict[str, dict]) -> Tuple[Callable[[int], Optional[dict]], Callable[[float], Optional[dict]]]:
+    """
+    (smallest_meeting_cpu, smallest_meeting_mem) closures over the catalog sorted once each way,
+    answering every row with a bisect instead of a filter + sort of the whole catalog.
+    """
+    by_cpu = sorted(catalog.values(), key=lambda x: (x["vcpu"], x["memory_gib"], x["instanceType"]))
+    by_mem = sorted(catalog.values(), key=lambda x: (x["memory_gib"], x["vcpu"], x["instanceType"]))
+    cpu_keys = [x["vcpu"] for x in by_cpu]
+    mem_keys = [x["memory_gib"] for x in by_mem]
+
+    def smallest_meeting_cpu(vcpu_needed: int) -> Optional[dict]:
+        i = bisect.bisect_left(cpu_keys, vcpu_needed)
+        return by_cpu[i] if i < len(by_cpu) else None
+
+    def smallest_meeting_mem(mem_needed: float) -> Optional[dict]:
+        i = bisect.bisect_left(mem_keys, mem_needed)
+        return by_mem[i] if i < len(by_mem) else None
+
+    return smallest_meeting_cpu, smallest_meeting_mem
+
 # ---------- Pricing ----------
 AWS_REGION_TO_LOCATION = {
     "us-east-1": "US East (N. Virginia)",
@@ -222,36 +278,116 @@ AWS_REGION_TO_LOCATION = {
     "af-south-1": "Africa (Cape Town)",
 }
 
+def _pricing_client():
+    """Pricing API client, created on first use and reused for every row."""
+    return _client("pricing", "us-east-1")  # Pricing API endpoint
+
+def _single_dimension(pl_obj: dict) -> Optional[dict]:
+    """The price dimension when a product has exactly one OnDemand term with one dimension (the usual shape)."""
+    od = pl_obj.get("terms", {}).get("OnDemand") or {}
+    if len(od) != 1:
+        return None
+    dims = next(iter(od.values())).get("priceDimensions") or {}
+    return next(iter(dims.values())) if len(dims) == 1 else None
+
+def _ec2_hourly_usd(pl_obj: dict) -> Optional[float]:
+    dim = _single_dimension(pl_obj)
+    if dim is not None:
+        usd = dim.get("pricePerUnit", {}).get("USD") if dim.get("unit") == "Hrs" else None
+        try:
+            return float(usd) if usd is not None else None
+        except ValueError:
+            return None
+    for term in pl_obj.get("terms", {}).get("OnDemand", {}).values():
+        for dim in term.get("priceDimensions", {}).values():
+            if dim.get("unit") == "Hrs":
+                usd = dim.get("pricePerUnit", {}).get("USD")
+                if usd is not None:
+                    try:
+                        return float(usd)
+                    except ValueError:
+                        pass
+    return None
+
+def _price_table(service_code: str, filters: List[dict], first_usd: Callable[[dict], Optional[float]]) -> Dict[str, float]:
+    """{instanceType: hourly USD} over every page of one get_products query (first hit per type wins)."""
+    table: Dict[str, float] = {}
+    pages = _pricing_client().get_paginator("get_products").paginate(
+        ServiceCode=service_code, Filters=filters, PaginationConfig={"PageSize": 100}
+    )
+    for page in pages:
+        for pl in page.get("PriceList", []):
+            try:
+                o = _loads(pl)
+            except Exception:
+                continue
+            itype = o.get("product", {}).get("attributes", {}).get("instanceType")
+            if not itype or itype in table:
+                continue
+            usd = first_usd(o)
+            if usd is not None:
+                table[itype] = usd
+    return table
+
+# Filters shared by every EC2 on-demand query; built once (botocore only reads request params).
+_EC2_BASE_FILTERS = (
+    {"Type": "TERM_MATCH", "Field": "tenancy", "Value": "Shared"},
+    {"Type": "TERM_MATCH", "Field": "preInstalledSw", "Value": "NA"},
+    {"Type": "TERM_MATCH", "Field": "capacitystatus", "Value": "Used"},
+)
+
+# One sweep per (region, OS) / (region, engine, deployment, license) instead of one query per row
+_EC2_PRICE_TABLES: Dict[Tuple[str, str], Dict[str, float]] = {}
+_RDS_PRICE_TABLES: Dict[Tuple[str, str, str, str], Dict[str, float]] = {}
+
+def fetch_ec2_price_table(region: str, os_name: str) -> Dict[str, float]:
+    """Returns {instance_type: hourly USD} for every Shared/NA/Used On-Demand EC2 product in a region/OS."""
+    key = (region, os_name)
+    if key not in _EC2_PRICE_TABLES:
+        location = AWS_REGION_TO_LOCATION.get(region)
+        if not location:
+            return {}
+        filters = [
+            {"Type": "TERM_MATCH", "Field": "location", "Value": location},
+            {"Type": "TERM_MATCH", "Field": "operatingSystem", "Value": os_name},
+            *_EC2_BASE_FILTERS,
+        ]
+        _EC2_PRICE_TABLES[key] = _price_table("AmazonEC2", filters, _ec2_hourly_usd)
+    return _EC2_PRICE_TABLES[key]
+
 def price_ec2_ondemand(instance_type: str, region: str, os_name: str = "Linux") -> Optional[float]:
     """Returns hourly USD On-Demand price for the given instance type/region/OS."""
-    boto3 = _lazy_boto3()
     location = AWS_REGION_TO_LOCATION.get(region)
     if not location:
         return None
-    pricing = boto3.client("pricing", region_name="us-east-1")  # Pricing API endpoint
+    try:
+        return fetch_ec2_price_table(region, os_name).get(instance_type)
+    except Exception:
+        pass  # bulk sweep failed; fall back to a single narrow query
+    pricing = _pricing_client()
     filters = [
         {"Type": "TERM_MATCH", "Field": "instanceType", "Value": instance_type},
         {"Type": "TERM_MATCH", "Field": "location", "Value": location},
         {"Type": "TERM_MATCH", "Field": "operatingSystem", "Value": os_name},
-        {"Type": "TERM_MATCH", "Field": "tenancy", "Value": "Shared"},
-        {"Type": "TERM_MATCH", "Field": "preInstalledSw", "Value": "NA"},
-        {"Type": "TERM_MATCH", "Field": "capacitystatus", "Value": "Used"},
+        *_EC2_BASE_FILTERS,
     ]
     resp = pricing.get_products(ServiceCode="AmazonEC2", Filters=filters, MaxResults=100)
     for pl in resp.get("PriceList", []):
-        o = json.loads(pl)
-        for term in o.get("terms", {}).get("OnDemand", {}).values():
-            for dim in term.get("priceDimensions", {}).values():
-                if dim.get("unit") == "Hrs":
-                    usd = dim.get("pricePerUnit", {}).get("USD")
-                    if usd is not None:
-                        try:
-                            return float(usd)
-                        except ValueError:
-                            pass
+        usd = _ec2_hourly_usd(_loads(pl))
+        if usd is not None:
+            return usd
     return None
 def _pricing_first_usd(pl_obj: dict) -> Optional[float]:
     # Extract first USD "Hrs" or "Quantity" price from a PriceList product
+    dim = _single_dimension(pl_obj)
+    if dim is not None:
+        usd = dim.get("pricePerUnit", {}).get("USD")
+        if usd and dim.get("unit") in {"Hrs", "Quantity"}:
+            try:
+                return float(usd)
+            except Exception:
+                pass
+        return None
     for term in pl_obj.get("terms", {}).get("OnDemand", {}).values():
         for dim in term.get("priceDimensions", {}).values():
             usd = dim.get("pricePerUnit", {}).get("USD")
@@ -271,7 +407,6 @@ def price_rds_ondemand(engine: str, instance_class: str, region: str, license_mo
     license_model: 'AWS' (license-included) or 'BYOL'
     multi_az: True/False
     """
-    boto3 = _lazy_boto3()
     location = AWS_REGION_TO_LOCATION.get(region)
     if not location:
         return None
@@ -280,7 +415,20 @@ def price_rds_ondemand(engine: str, instance_class: str, region: str, license_mo
     lm = "License included" if (str(license_model).strip().lower() != "byol") else "Bring your own license"
     dep = "Multi-AZ" if multi_az else "Single-AZ"
 
-    pricing = boto3.client("pricing", region_name="us-east-1")
+    key = (region, engine, dep, lm)
+    try:
+        if key not in _RDS_PRICE_TABLES:
+            _RDS_PRICE_TABLES[key] = _price_table("AmazonRDS", [
+                {"Type":"TERM_MATCH","Field":"location","Value":location},
+                {"Type":"TERM_MATCH","Field":"databaseEngine","Value":engine},
+                {"Type":"TERM_MATCH","Field":"deploymentOption","Value":dep},
+                {"Type":"TERM_MATCH","Field":"licenseModel","Value":lm},
+            ], _pricing_first_usd)
+        return _RDS_PRICE_TABLES[key].get(instance_class)
+    except Exception:
+        pass  # bulk sweep failed; fall back to a single narrow query
+
+    pricing = _pricing_client()
     filters = [
         {"Type":"TERM_MATCH","Field":"location","Value":location},
         {"Type":"TERM_MATCH","Field":"databaseEngine","Value":engine},
@@ -295,7 +443,7 @@ def price_rds_ondemand(engine: str, instance_class: str, region: str, license_mo
 
     for pl in resp.get("PriceList", []):
         try:
-            o = json.loads(pl)
+            o = _loads(pl)
         except Exception:
             continue
         usd = _pricing_first_usd(o)
@@ -304,6 +452,10 @@ def price_rds_ondemand(engine: str, instance_class: str, region: str, license_mo
     return None
 
 # ---------- I/O (CSV + Excel) ----------
+_CSV_SUFFIX = ".csv"
+_EXCEL_SUFFIXES = frozenset({".xlsx", ".xls"})
+_INPUT_SUFFIXES = _EXCEL_SUFFIXES | {_CSV_SUFFIX}
+
 def _prompt_for_input_path() -> Path:
     print("Enter the path to your input file (.csv, .xlsx, or .xls):")
     while True:
@@ -315,37 +467,109 @@ def _prompt_for_input_path() -> Path:
         if not p.exists():
             print(f"❌ File not found: {p}\nTry again:")
             continue
-        if p.suffix.lower() not in {".csv", ".xlsx", ".xls"}:
+        if p.suffix.lower() not in _INPUT_SUFFIXES:
             print("❌ Unsupported file type. Please provide .csv, .xlsx, or .xls")
             continue
         return p
 
 def _maybe_prompt_for_sheet(path: Path, sheet: Optional[str]) -> Optional[str]:
-    if path.suffix.lower() in {".xlsx", ".xls"} and not sheet:
+    if path.suffix.lower() in _EXCEL_SUFFIXES and not sheet:
         print("Excel file detected. Enter a sheet name (or press Enter for the first sheet):")
         s = input("> ").strip()
         return s or None
     return sheet
 
-def read_rows(path: str, sheet: Optional[str] = None) -> List[dict]:
+def _excel_engine() -> Optional[str]:
+    # calamine (pip install python-calamine) parses workbooks far faster than openpyxl.
+    # pandas only accepts engine="calamine" from 2.2 on; older versions keep the default engine.
+    try:
+        import python_calamine  # type: ignore  # noqa: F401
+    except ImportError:
+        return None
+    ver = _lazy_pandas().__version__.split(".")
+    try:
+        return "calamine" if (int(ver[0]), int(ver[1])) >= (2, 2) else None
+    except (IndexError, ValueError):
+        return None
+
+def _iter_xlsx_rows_streaming(p: Path, sheet: Optional[str]) -> Optional[Iterator[dict]]:
+    """
+    Stream an .xlsx sheet row by row with openpyxl's read-only mode instead of loading it into a DataFrame.
+    Returns None (use pandas) when openpyxl is missing or the header has blank/duplicate names,
+    which pandas renames ("Unnamed: n", "col.1") and callers may rely on.
+
+    Cells are openpyxl's raw values, not pandas' column dtypes: 2 stays 2 (pandas gives 2.0 in a
+    column with blanks) and blank cells are None (pandas gives nan), so carried-through input
+    columns print differently than on the pandas/calamine path. Rows are the same: every row
+    has every header column, and blank spacer rows are kept, as pandas does.
+    """
+    try:
+        from openpyxl import load_workbook  # type: ignore
+    except ImportError:
+        return None
+    try:
+        wb = load_workbook(p, read_only=True, data_only=True)
+        ws = wb[sheet] if sheet is not None else wb.worksheets[0]
+        it = ws.iter_rows(values_only=True)
+        header = next(it, None)
+    except Exception:
+        return None
+    names = [str(c).strip() for c in header] if header else []
+    if not names or None in header or len(set(names)) != len(names):
+        wb.close()
+        return None
+
+    def rows() -> Iterator[dict]:
+        try:
+            pad = itertools.repeat(None)
+            for values in it:
+                # read-only rows can stop short of the header; CsvStreamWriter takes its header from the first row
+                yield dict(zip(names, itertools.chain(values, pad)))
+        finally:
+            wb.close()
+    return rows()
+
+def iter_rows(path: str, sheet: Optional[str] = None) -> Iterator[dict]:
+    """
+    Yield input rows one at a time (CSV and, without calamine, .xlsx are streamed; otherwise the sheet is read then yielded).
+    Streamed .xlsx cells keep openpyxl's raw values; see _iter_xlsx_rows_streaming.
+    """
     p = Path(path)
     suffix = p.suffix.lower()
-    if suffix == ".csv":
+    if suffix == _CSV_SUFFIX:
         with open(p, newline="", encoding="utf-8") as f:
-            return list(csv.DictReader(f))
-    elif suffix in {".xlsx", ".xls"}:
+            yield from csv.DictReader(f)
+    elif suffix in _EXCEL_SUFFIXES:
+        engine = _excel_engine()
+        if engine is None and suffix == ".xlsx":
+            streamed = _iter_xlsx_rows_streaming(p, sheet)
+            if streamed is not None:
+                yield from streamed
+                return
         pd = _lazy_pandas()
         try:
-            df = pd.read_excel(p, sheet_name=sheet if sheet is not None else 0)
+            df = pd.read_excel(p, sheet_name=sheet if sheet is not None else 0, engine=engine)
         except Exception as e:
             print(f"❌ Failed to read Excel file: {e}", file=sys.stderr)
             sys.exit(1)
         df.columns = [str(c).strip() for c in df.columns]
-        return df.to_dict(orient="records")
+        for rec in df.itertuples(index=False, name=None):
+            yield dict(zip(df.columns, rec))
     else:
         print("❌ Unsupported input file format (use .csv, .xlsx, or .xls)", file=sys.stderr)
         sys.exit(1)
 
+def read_rows(path: str, sheet: Optional[str] = None) -> List[dict]:
+    return list(iter_rows(path, sheet=sheet))
+
+def _nonempty_rows(path: str, sheet: Optional[str]) -> Iterator[dict]:
+    """iter_rows(), but exit early with the usual message when the file has no data rows."""
+    rows = iter_rows(path, sheet=sheet)
+    first = next(rows, None)
+    if first is None:
+        raise SystemExit("❌ Input file has no rows.")
+    return itertools.chain([first], rows)
+
 def write_rows(path: str, rows: List[dict], fieldnames: List[str]) -> None:
     with open(path, "w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fieldnames)
@@ -353,6 +577,40 @@ def write_rows(path: str, rows: List[dict], fieldnames: List[str]) -> None:
         for r in rows:
             w.writerow(r)
 
+class CsvStreamWriter:
+    """
+    Write rows to CSV as they are produced instead of collecting them first.
+    The header comes from fieldnames_for(first_row), or fieldnames_for(None) if no rows were written.
+
+        with CsvStreamWriter(path, fieldnames_for) as w:
+            for row in rows:
+                w.write(row)
+    """
+    def __init__(self, path: str, fieldnames_for: Callable[[Optional[dict]], List[str]]):
+        self.path = path
+        self.fieldnames_for = fieldnames_for
+        self.count = 0
+        self._f = None
+        self._w = None
+
+    def __enter__(self) -> "CsvStreamWriter":
+        self._f = open(self.path, "w", newline="", encoding="utf-8")
+        return self
+
+    def write(self, row: dict) -> None:
+        if self._w is None:
+            self._w = csv.DictWriter(self._f, fieldnames=self.fieldnames_for(row), extrasaction="ignore")
+            self._w.writeheader()
+        self._w.writerow(row)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if self._w is None and exc_type is None:
+                csv.writer(self._f).writerow(self.fieldnames_for(None))
+        finally:
+            self._f.close()
+
 # ---------- CLI Commands ----------
 def cmd_recommend(args):
     # Resolve region: CLI arg -> AWS_REGION env -> profile default
@@ -373,59 +631,9 @@ def cmd_recommend(args):
         args.sheet = _maybe_prompt_for_sheet(given, args.sheet)
 
     catalog = fetch_instance_catalog(region)
-    rows = read_rows(args.input, sheet=args.sheet)
-    if not rows:
-        raise SystemExit("❌ Input file has no rows.")
-
-    out_rows = []
-    for r in rows:
-        try:
-            rid = r["id"]
-            vcpu = int(r["vcpu"])
-            mem_gib = float(r["memory_gib"])
-        except Exception:
-            print(f"Skipping row with missing/invalid values: {r}", file=sys.stderr)
-            continue
-
-        prof = (str(r.get("profile", "")).strip().lower() if r.get("profile") is not None else "")
-        if prof not in ("balanced", "compute", "memory"):
-            prof = infer_profile(vcpu, mem_gib)
+    smallest_meeting_cpu, smallest_meeting_mem = _smallest_meeting_lookups(catalog)
+    rows = _nonempty_rows(args.input, args.sheet)
 
-        chosen = pick_instance(catalog, prof, vcpu, mem_gib)
-
-        overprov_vcpu, overprov_mem_gib, fit_reason = "", "", ""
-        if chosen:
-            overprov_vcpu = chosen["vcpu"] - vcpu
-            overprov_mem_gib = round(chosen["memory_gib"] - mem_gib, 2)
-            if chosen["vcpu"] == vcpu and round(chosen["memory_gib"], 2) == round(mem_gib, 2):
-                fit_reason = "exact"
-            else:
-                cpu_only = _smallest_meeting_cpu(catalog, vcpu)
-                mem_only = _smallest_meeting_mem(catalog, mem_gib)
-                def rank(x): return (x["vcpu"], x["memory_gib"]) if x else (float("inf"), float("inf"))
-                if cpu_only or mem_only:
-                    fit_reason = "memory-bound" if rank(mem_only) >= rank(cpu_only) else "cpu-bound"
-                else:
-                    fit_reason = "no-fit-fallback"
-
-        base = dict(r)  # carry ALL original columns through
-
-        base.update({
-            "id": rid,
-            "requested_vcpu": vcpu,
-            "requested_memory_gib": mem_gib,
-            "profile": prof,
-            "region": region,
-            "recommended_instance_type": chosen["instanceType"] if chosen else "",
-            "rec_vcpu": chosen["vcpu"] if chosen else "",
-            "rec_memory_gib": f'{chosen["memory_gib"]:.2f}' if chosen else "",
-            "overprov_vcpu": overprov_vcpu,
-            "overprov_mem_gib": overprov_mem_gib,
-            "fit_reason": fit_reason,
-            "note": "" if chosen else "No matching current-gen x86_64 found; consider GPU/ARM or older-gen.",
-        })
-        out_rows.append(base)
-    
     out_path = make_output_path("recommend", args.output)
 
     preferred = [
@@ -434,13 +642,59 @@ def cmd_recommend(args):
         "overprov_vcpu","overprov_mem_gib","fit_reason","note"
     ]
 
-    # Collect every key that appears in any row
-    all_keys = {k for row in out_rows for k in row.keys()}
+    # Preferred order first, then any other input columns (every row carries the same input columns)
+    def fieldnames_for(first: Optional[dict]) -> List[str]:
+        return preferred + [k for k in (first or {}) if k not in preferred]
 
-    # Start with preferred order, then append anything else
-    fieldnames = preferred + [k for k in all_keys if k not in preferred]
+    with CsvStreamWriter(out_path, fieldnames_for) as writer:
+        for r in rows:
+            try:
+                rid = r["id"]
+                vcpu = int(r["vcpu"])
+                mem_gib = float(r["memory_gib"])
+            except Exception:
+                print(f"Skipping row with missing/invalid values: {r}", file=sys.stderr)
+                continue
+
+            prof = (str(r.get("profile", "")).strip().lower() if r.get("profile") is not None else "")
+            if prof not in ("balanced", "compute", "memory"):
+                prof = infer_profile(vcpu, mem_gib)
+
+            chosen = pick_instance(catalog, prof, vcpu, mem_gib)
+
+            overprov_vcpu, overprov_mem_gib, fit_reason = "", "", ""
+            if chosen:
+                overprov_vcpu = chosen["vcpu"] - vcpu
+                overprov_mem_gib = round(chosen["memory_gib"] - mem_gib, 2)
+                if chosen["vcpu"] == vcpu and round(chosen["memory_gib"], 2) == round(mem_gib, 2):
+                    fit_reason = "exact"
+                else:
+                    cpu_only = smallest_meeting_cpu(vcpu)
+                    mem_only = smallest_meeting_mem(mem_gib)
+                    def rank(x): return (x["vcpu"], x["memory_gib"]) if x else (float("inf"), float("inf"))
+                    if cpu_only or mem_only:
+                        fit_reason = "memory-bound" if rank(mem_only) >= rank(cpu_only) else "cpu-bound"
+                    else:
+                        fit_reason = "no-fit-fallback"
+
+            base = dict(r)  # carry ALL original columns through
+
+            base.update({
+                "id": rid,
+                "requested_vcpu": vcpu,
+                "requested_memory_gib": mem_gib,
+                "profile": prof,
+                "region": region,
+                "recommended_instance_type": chosen["instanceType"] if chosen else "",
+                "rec_vcpu": chosen["vcpu"] if chosen else "",
+                "rec_memory_gib": round(chosen["memory_gib"], 2) if chosen else "",
+                "overprov_vcpu": overprov_vcpu,
+                "overprov_mem_gib": overprov_mem_gib,
+                "fit_reason": fit_reason,
+                "note": "" if chosen else "No matching current-gen x86_64 found; consider GPU/ARM or older-gen.",
+            })
+            writer.write(base)
 
-    write_rows(out_path, out_rows, fieldnames)
     print(f"Wrote recommendations → {out_path}")
 
 
@@ -471,105 +725,100 @@ def cmd_price(args):
         given = Path(args.input)
         args.sheet = _maybe_prompt_for_sheet(given, args.sheet)
 
-    # Read input (CSV/Excel)
-    rows = read_rows(args.input, sheet=args.sheet)
-    if not rows:
-        raise SystemExit("❌ Input file has no rows.")
-    # Price rows
-    out_rows = []
-    for r in rows:
-        # --------- Inputs from row (with safe defaults) ----------
-        itype = r.get("recommended_instance_type") or r.get("instance_type") or ""
-        region_row = r.get("region") or args.region
-        os_row = (r.get("os") or args.os or "Linux").strip()
-        license_model = (r.get("license_model") or "AWS").strip()  # 'AWS' or 'BYOL'
-        ebs_gb = _as_float(r.get("ebs_gb"), 0.0)
-        ebs_type = (r.get("ebs_type") or "gp3").strip()
-        ebs_iops = _as_int(r.get("ebs_iops"), 0)  # currently unused in simplified model
-        s3_gb = _as_float(r.get("s3_gb"), 0.0)
-        net_prof = (r.get("network_profile") or "").strip()
-        db_engine = (r.get("db_engine") or "").strip()
-        db_class = (r.get("db_instance_class") or "").strip()
-        db_storage_gb = _as_float(r.get("db_storage_gb"), 0.0)  # not charged separately here; could be added later via pricing API
-        db_multi_az = _as_bool(r.get("multi_az"), False)
-
-        # --------- Compute OS to use for EC2 compute price ----------
-        # If BYOL → charge compute at Linux rate (no OS uplift). Else use declared OS.
-        os_for_compute = "Linux" if license_model.lower() == "byol" else os_row
-
-        # --------- EC2 hourly price ----------
-        if not itype or not region_row:
-            # Missing required fields for compute pricing
-            compute_price = None
-            r["pricing_note"] = "Missing instance_type or region"
-        else:
-            compute_price = price_ec2_ondemand(itype, region_row, os_name=os_for_compute)
-            if compute_price is None:
-                r["pricing_note"] = "No EC2 price found (check filters/region/OS)"
-            else:
-                r["pricing_note"] = r.get("pricing_note","")
-
-        # --------- Monthly compute ----------
-        hours = float(args.hours_per_month)
-        compute_monthly = monthly_compute_cost(compute_price, hours)
-
-        if getattr(args, "no_monthly", False):
-            r["price_per_hour_usd"] = f"{compute_price:.6f}" if compute_price is not None else ""
-            # blank all monthly columns when --no-monthly is set
-            r["monthly_compute_usd"] = ""
-            r["monthly_ebs_usd"] = ""
-            r["monthly_s3_usd"] = ""
-            r["monthly_network_usd"] = ""
-            r["monthly_db_usd"] = ""
-            r["monthly_total_usd"] = ""
-        else:
-            r["price_per_hour_usd"] = f"{compute_price:.6f}" if compute_price is not None else ""
-            r["monthly_compute_usd"] = f"{compute_monthly:.2f}"
-            r["monthly_ebs_usd"] = f"{monthly_ebs_cost(ebs_gb, ebs_type):.2f}"
-            r["monthly_s3_usd"] = f"{monthly_s3_cost(s3_gb):.2f}"
-            r["monthly_network_usd"] = f"{monthly_network_cost(net_prof):.2f}"
-            if db_engine and db_class and region_row:
-                db_monthly = monthly_rds_cost(db_engine, db_class, region_row, license_model, db_multi_az, hours)
-            else:
-                db_monthly = 0.0
-            r["monthly_db_usd"] = f"{db_monthly:.2f}"
-            parts = [
-                _as_float(r["monthly_compute_usd"], 0.0),
-                _as_float(r["monthly_ebs_usd"], 0.0),
-                _as_float(r["monthly_s3_usd"], 0.0),
-                _as_float(r["monthly_network_usd"], 0.0),
-                _as_float(r["monthly_db_usd"], 0.0),
-            ]
-            r["monthly_total_usd"] = f"{sum(parts):.2f}"
-                    
-        out_rows.append(r)
+    # Read input (CSV/Excel) lazily and price each row as it streams through
+    rows = _nonempty_rows(args.input, args.sheet)
 
     # Preserve columns + add pricing fields if absent
-    fieldnames = list(out_rows[0].keys()) if out_rows else []
-    for col in [
-        "price_per_hour_usd",
-        "monthly_compute_usd",
-        "monthly_ebs_usd",
-        "monthly_s3_usd",
-        "monthly_network_usd",
-        "monthly_db_usd",
-        "monthly_total_usd",
-        "pricing_note",
-    ]:
-        if col not in fieldnames:
-            fieldnames.append(col)
+    def fieldnames_for(first: Optional[dict]) -> List[str]:
+        fieldnames = list(first.keys()) if first else []
+        for col in [
+            "price_per_hour_usd",
+            "monthly_compute_usd",
+            "monthly_ebs_usd",
+            "monthly_s3_usd",
+            "monthly_network_usd",
+            "monthly_db_usd",
+            "monthly_total_usd",
+            "pricing_note",
+        ]:
+            if col not in fieldnames:
+                fieldnames.append(col)
+        return fieldnames
 
     out_path = make_output_path("price", args.output)
     print(f"Input:  {args.input}")
     print(f"Output: {out_path}")
-    write_rows(out_path, out_rows, fieldnames)
+    hours = float(args.hours_per_month)
+    with CsvStreamWriter(out_path, fieldnames_for) as writer:
+        for r in rows:
+            # --------- Inputs from row (with safe defaults) ----------
+            itype = r.get("recommended_instance_type") or r.get("instance_type") or ""
+            region_row = r.get("region") or args.region
+            os_row = (r.get("os") or args.os or "Linux").strip()
+            license_model = (r.get("license_model") or "AWS").strip()  # 'AWS' or 'BYOL'
+            ebs_gb = _as_float(r.get("ebs_gb"), 0.0)
+            ebs_type = (r.get("ebs_type") or "gp3").strip().lower()
+            ebs_iops = _as_int(r.get("ebs_iops"), 0)  # currently unused in simplified model
+            s3_gb = _as_float(r.get("s3_gb"), 0.0)
+            net_prof = (r.get("network_profile") or "").strip().lower()
+            db_engine = (r.get("db_engine") or "").strip()
+            db_class = (r.get("db_instance_class") or "").strip()
+            db_storage_gb = _as_float(r.get("db_storage_gb"), 0.0)  # not charged separately here; could be added later via pricing API
+            db_multi_az = _as_bool(r.get("multi_az"), False)
+
+            # --------- Compute OS to use for EC2 compute price ----------
+            # If BYOL → charge compute at Linux rate (no OS uplift). Else use declared OS.
+            os_for_compute = "Linux" if license_model.lower() == "byol" else os_row
+
+            # --------- EC2 hourly price ----------
+            if not itype or not region_row:
+                # Missing required fields for compute pricing
+                compute_price = None
+                r["pricing_note"] = "Missing instance_type or region"
+            else:
+                compute_price = price_ec2_ondemand(itype, region_row, os_name=os_for_compute)
+                if compute_price is None:
+                    r["pricing_note"] = "No EC2 price found (check filters/region/OS)"
+                else:
+                    r["pricing_note"] = r.get("pricing_note","")
+
+            # --------- Monthly compute ----------
+            compute_monthly = monthly_compute_cost(compute_price, hours)
+
+            if getattr(args, "no_monthly", False):
+                r["price_per_hour_usd"] = f"{compute_price:.6f}" if compute_price is not None else ""
+                # blank all monthly columns when --no-monthly is set
+                r["monthly_compute_usd"] = ""
+                r["monthly_ebs_usd"] = ""
+                r["monthly_s3_usd"] = ""
+                r["monthly_network_usd"] = ""
+                r["monthly_db_usd"] = ""
+                r["monthly_total_usd"] = ""
+            else:
+                r["price_per_hour_usd"] = f"{compute_price:.6f}" if compute_price is not None else ""
+                r["monthly_compute_usd"] = f"{compute_monthly:.2f}"
+                ebs_monthly = monthly_ebs_cost(ebs_gb, ebs_type)
+                s3_monthly = monthly_s3_cost(s3_gb)
+                net_monthly = monthly_network_cost(net_prof)
+                r["monthly_ebs_usd"] = f"{ebs_monthly:.2f}"
+                r["monthly_s3_usd"] = f"{s3_monthly:.2f}"
+                r["monthly_network_usd"] = f"{net_monthly:.2f}"
+                if db_engine and db_class and region_row:
+                    db_monthly = monthly_rds_cost(db_engine, db_class, region_row, license_model, db_multi_az, hours)
+                else:
+                    db_monthly = 0.0
+                r["monthly_db_usd"] = f"{db_monthly:.2f}"
+                # Every part is already rounded to cents; sum the floats instead of re-parsing the strings
+                r["monthly_total_usd"] = f"{compute_monthly + ebs_monthly + s3_monthly + net_monthly + db_monthly:.2f}"
+            writer.write(r)
+
     print(f"Wrote priced recommendations → {out_path}")
 
 def monthly_compute_cost(price_per_hour: Optional[float], hours: float) -> float:
     return round((price_per_hour or 0.0) * hours, 2)
 
 def monthly_ebs_cost(ebs_gb: float, ebs_type: str = "gp3") -> float:
-    et = (ebs_type or "gp3").strip().lower()
+    et = ebs_type if ebs_type in ("gp3", "io1") else (ebs_type or "gp3").strip().lower()
     if et == "io1":
         rate = EBS_IO1_GB_MONTH
     else:
@@ -582,7 +831,9 @@ def monthly_s3_cost(s3_gb: float) -> float:
 def monthly_network_cost(profile: str) -> float:
     if not profile:
         return 0.0
-    gb = NETWORK_PROFILE_TO_GB.get(profile.strip().lower())
+    gb = NETWORK_PROFILE_TO_GB.get(profile)
+    if gb is None:
+        gb = NETWORK_PROFILE_TO_GB.get(profile.strip().lower())
     if gb is None:
         return 0.0
     return round(gb * DTO_GB_PRICE, 2)
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import itertools
+import os
 import sys
+import time
 from pathlib import Path
-from typing import Optional, List, Dict
-import re
+from typing import TYPE_CHECKING, Optional, List, Dict
 from glob import glob
 
 import click
-import pandas as pd
+import numpy as np
 
-try:
-    from summary import write_run_summary, prompt_and_update_tracking
-except ImportError:
-    write_run_summary = None
-    prompt_and_update_tracking = None  # type: ignore
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _lazy_pandas():
+    # Imported on first use: pandas is most of the startup time, and --help / list-* / baseline don't need it.
+    import pandas as pd
+    return pd
+
+def _summary_funcs():
+    """(write_run_summary, prompt_and_update_tracking), or (None, None) without summary.py; imported on first use."""
+    try:
+        from summary import write_run_summary, prompt_and_update_tracking
+        return write_run_summary, prompt_and_update_tracking
+    except ImportError:
+        return None, None
 
 # ---------------------- Imports from local modules ----------------------
 from validator import (
@@ -21,29 +33,28 @@ from validator import (
     write_validator_report,
 )
 from recommender import (
-    infer_profile,
     fetch_instance_catalog,           # AWS
-    pick_instance,
-    smallest_meeting_cpu,
-    smallest_meeting_mem,
+    catalog_arrays,
+    pick_instances,
+    smallest_meeting_cpu_many,
+    smallest_meeting_mem_many,
     fetch_azure_vm_catalog,           # Azure
-    pick_azure_size,
+    pick_azure_sizes,
     normalize_azure_region,           # Azure region normalizer
 )
 from pricing import (
-    read_rows, write_rows,
-    price_ec2_ondemand,
-    monthly_compute_cost, monthly_ebs_cost, monthly_s3_cost,
-    monthly_network_cost, monthly_rds_cost,
+    read_rows, write_rows, excel_engine,
+    price_ec2_ondemand, prefetch_ec2_prices, prefetch_rds_prices,
+    monthly_compute_cost, monthly_storage_network_costs, monthly_rds_cost,
     # Azure DB pricing helpers (already implemented in pricing.py)
     monthly_azure_sql_cost,
 )
 
 # Azure VM price function may be optional depending on your tree — import defensively.
 try:
-    from pricing import azure_vm_price_hourly  # type: ignore
+    from pricing import azure_vm_price_hourly, prefetch_azure_vm_prices  # type: ignore
 except Exception:
-    azure_vm_price_hourly = None  # type: ignore
+    azure_vm_price_hourly = prefetch_azure_vm_prices = None  # type: ignore
 
 # Baseline module (prompt-driven)
 try:
@@ -58,6 +69,15 @@ except Exception:
 
 # ---------------------- Small utilities ----------------------
 def as_float(x, default=0.0) -> float:
+    if type(x) is str:  # CSV cells: the common case, checked first
+        if not x:
+            return default
+        try:
+            return float(x)
+        except ValueError:
+            return default
+    if isinstance(x, (int, float)):
+        return float(x)  # already numeric (pandas/Excel cells): no string checks
     try:
         if x is None or x == "":
             return default
@@ -67,6 +87,8 @@ def as_float(x, default=0.0) -> float:
 
 def as_float_opt(x) -> float | None:
     """Parse to float or return None when not provided/invalid."""
+    if isinstance(x, (int, float)):
+        return float(x)
     try:
         if x is None or str(x).strip() == "":
             return None
@@ -75,22 +97,29 @@ def as_float_opt(x) -> float | None:
         return None
 
 def as_int(x, default=0) -> int:
+    if type(x) is int:
+        return x
     try:
+        if type(x) is float:
+            return int(x)  # same as int(float(x)); NaN/inf still fall through to default
         if x is None or x == "":
             return default
         return int(float(x))
     except Exception:
         return default
 
+_TRUE_STRINGS = frozenset({"y", "yes", "true", "1"})
+_FALSE_STRINGS = frozenset({"n", "no", "false", "0"})
+
 def as_bool(x, default=False) -> bool:
     if isinstance(x, bool):
         return x
     if x is None:
         return default
     s = str(x).strip().lower()
-    if s in {"y", "yes", "true", "1"}:
+    if s in _TRUE_STRINGS:
         return True
-    if s in {"n", "no", "false", "0"}:
+    if s in _FALSE_STRINGS:
         return False
     return default
 
@@ -103,14 +132,21 @@ def cloud_from_str(s: Optional[str]) -> str:
 
 # ---------------------- Output helpers (date/timestamped folders) ----------------------
 def _now_date_time():
-    import datetime as _dt
-    d = _dt.datetime.now()
-    return d.strftime("%Y-%m-%d"), d.strftime("%H%M%S")
+    date_str, time_str = time.strftime("%Y-%m-%d|%H%M%S").split("|")
+    return date_str, time_str
 
 def _ensure_dir(p: Path) -> Path:
     p.mkdir(parents=True, exist_ok=True)
     return p
 
+def _is_run_date(s: str) -> bool:
+    # YYYY-MM-DD; isdecimal() accepts exactly what the regex \d did
+    return len(s) == 10 and s[4] == "-" and s[7] == "-" and (s[:4] + s[5:7] + s[8:]).isdecimal()
+
+def _is_run_time(s: str) -> bool:
+    # HHMMSS
+    return len(s) == 6 and s.isdecimal()
+
 def _derive_run_dir_from_recommend(rec_path: Path) -> Optional[Path]:
     """
     If the recommend file already lives in output/YYYY-MM-DD/HHMMSS/,
@@ -120,7 +156,7 @@ def _derive_run_dir_from_recommend(rec_path: Path) -> Optional[Path]:
         parent = rec_path.resolve().parent
         date_dir = parent.parent.name
         time_dir = parent.name
-        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", date_dir) and re.fullmatch(r"\d{6}", time_dir):
+        if _is_run_date(date_dir) and _is_run_time(time_dir):
             return parent
     except Exception:
         pass
@@ -130,12 +166,13 @@ def _new_run_dir(base: Path = Path("output")) -> Path:
     date_str, time_str = _now_date_time()
     return _ensure_dir(base / date_str / time_str)
 
-def _default_paths_for_recommend(user_out: Optional[str], user_report: Optional[str]) -> tuple[Path, Path]:
+def _default_paths_for_recommend(user_out: Optional[str], user_report: Optional[str],
+                                 fmt: str = "csv") -> tuple[Path, Path]:
     """
     Decide file paths for recommend + validator report.
 
     If user provided explicit output paths, honor them (don’t force folders).
-    Otherwise create output/YYYY-MM-DD/HHMMSS/{recommend.csv, validator_report.csv}.
+    Otherwise create output/YYYY-MM-DD/HHMMSS/{recommend.<fmt>, validator_report.csv}.
     """
     if user_out or user_report:
         rec_path = Path(user_out) if user_out else None
@@ -148,11 +185,11 @@ def _default_paths_for_recommend(user_out: Optional[str], user_report: Optional[
         if rec_path and not rep_path:
             rep_path = rec_path.with_name("validator_report.csv")
         if rep_path and not rec_path:
-            rec_path = rep_path.parent / "recommend.csv"
+            rec_path = rep_path.parent / f"recommend.{fmt}"
         return rec_path, rep_path  # type: ignore[return-value]
 
     run_dir = _new_run_dir()
-    return run_dir / "recommend.csv", run_dir / "validator_report.csv"
+    return run_dir / f"recommend.{fmt}", run_dir / "validator_report.csv"
 
 def _default_path_for_price(rec_path: Optional[Path], user_out: Optional[str]) -> Path:
     """
@@ -169,28 +206,54 @@ def _default_path_for_price(rec_path: Optional[Path], user_out: Optional[str]) -
     run_dir = reuse_dir if reuse_dir else _new_run_dir()
     return run_dir / "price.csv"
 
+_RECOMMEND_NAMES = frozenset({"recommend.csv", "recommend.xlsx", "recommend.xls", "recommend.parquet"})
+_RECOMMEND_SUFFIXES = (".csv", ".xlsx", ".xls", ".parquet")
+
+def _scan_latest_recommend(root: Path) -> Optional[Path]:
+    """Newest recommend.* at any depth under root, or recommend_* directly in root (scandir walk)."""
+    return _scan_latest_output(root, _RECOMMEND_NAMES, "recommend_")
+
+def _scan_latest_output(root: Path, names, top_prefix: Optional[str] = None) -> Optional[Path]:
+    """
+    Newest file named in `names` at any depth under root (plus `top_prefix`*.csv|xlsx|xls|parquet directly
+    in root when given), in one scandir walk; DirEntry.stat() reuses what the walk already read.
+    """
+    best, best_t = None, -1.0
+    stack = [(str(root), True)]
+    while stack:
+        d, top = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                name = e.name
+                if name.startswith("."):
+                    continue  # glob() skips hidden entries too
+                if e.is_dir():
+                    stack.append((e.path, False))
+                elif name in names or (top and top_prefix and name.startswith(top_prefix)
+                                       and name.endswith(_RECOMMEND_SUFFIXES)):
+                    t = e.stat().st_mtime
+                    if t > best_t:
+                        best, best_t = e.path, t
+    return Path(best) if best else None
+
 def find_latest_output(patterns: Optional[List[str]] = None) -> Optional[Path]:
     """
     Find the most-recent *recommend* output file.
 
     Supports new nested layout:
-        output/YYYY-MM-DD/HHMMSS/recommend.csv|xlsx|xls
+        output/YYYY-MM-DD/HHMMSS/recommend.csv|xlsx|xls|parquet
     and legacy flat layout:
-        output/recommend_*.csv|xlsx|xls
+        output/recommend_*.csv|xlsx|xls|parquet
     """
     from glob import glob
 
     if patterns is None:
-        patterns = [
-            # New nested layout
-            "output/**/recommend.csv",
-            "output/**/recommend.xlsx",
-            "output/**/recommend.xls",
-            # Legacy flat files
-            "output/recommend_*.csv",
-            "output/recommend_*.xlsx",
-            "output/recommend_*.xls",
-        ]
+        # Default layouts: one walk of ./output instead of six recursive globs + a stat() per match
+        return _scan_latest_recommend(Path("output"))
 
     candidates: List[str] = []
     for pat in patterns:
@@ -209,11 +272,7 @@ def _find_baseline_csv(preferred_dir: Path) -> Optional[Path]:
     p = preferred_dir / "baseline.csv"
     if p.exists():
         return p
-    from glob import glob
-    candidates = glob("output/**/baseline.csv", recursive=True)
-    if not candidates:
-        return None
-    return max((Path(c) for c in candidates), key=lambda q: q.stat().st_mtime)
+    return _scan_latest_output(Path("output"), ("baseline.csv",))
 
 # ---------------------- CLI root ----------------------
 @click.group()
@@ -224,7 +283,9 @@ def cli():
 @cli.command(name="baseline")
 @click.option("--cloud", type=click.Choice(["aws"], case_sensitive=False), required=True,
               help="Only 'aws' is supported for baseline at this time.")
-def baseline_cmd(cloud):
+@click.option("--inputs", "inputs_path", type=click.Path(exists=True, dir_okay=False, allow_dash=True), default=None,
+              help="Read baseline inputs from a JSON/TOML file ('-' = JSON on stdin) instead of prompting.")
+def baseline_cmd(cloud, inputs_path):
     """
     Prompt-driven baseline cost capture for AWS VPC networking:
       - Transit Gateway (attachments + data)
@@ -240,7 +301,11 @@ def baseline_cmd(cloud):
         sys.exit(2)
 
     # Interactive prompts → compute → write baseline.csv into a fresh run folder
-    inputs = baseline_prompt()
+    try:
+        inputs = baseline_prompt(inputs_path)
+    except (OSError, ValueError) as e:
+        click.echo(f"ERROR: could not read baseline inputs: {e}", err=True)
+        sys.exit(2)
     rates  = baseline_rates(inputs.region)
     rows, total = compute_baseline(inputs, rates)
     # Prefer the latest recommend run folder so all artifacts stay together
@@ -250,6 +315,7 @@ def baseline_cmd(cloud):
     click.echo(f"Wrote baseline → {out_csv}")
 
     # Opportunistically refresh summary artifacts for that run folder
+    write_run_summary, _ = _summary_funcs()
     if write_run_summary:
         try:
             write_run_summary(run_dir, None, None)
@@ -286,6 +352,105 @@ def list_azure_regions():
             click.echo(r)
 
 
+_PROFILES = ("balanced", "compute", "memory")
+
+def _int_or_none(x):
+    try:
+        return int(x)
+    except Exception:
+        return None
+
+def _float_or_none(x):
+    try:
+        return float(x)
+    except Exception:
+        return None
+
+def _parse_needs(df: pd.DataFrame) -> List[Optional[tuple]]:
+    """
+    (vcpu, mem_gib, profile) per row of df, or None where vcpu/memory_gib don't parse,
+    with the same rules as int(vcpu) / float(memory_gib). Numeric columns are converted
+    in one pass; object columns fall back to per-value parsing.
+    """
+    pd = _lazy_pandas()
+    n = len(df)
+    vcol = df["vcpu"] if "vcpu" in df.columns else pd.Series([None] * n, dtype=object)
+    mcol = df["memory_gib"] if "memory_gib" in df.columns else pd.Series([None] * n, dtype=object)
+
+    if isinstance(vcol.dtype, np.dtype) and vcol.dtype.kind in "iub":
+        vcpu = vcol.to_numpy().astype(np.int64).tolist()
+    elif isinstance(vcol.dtype, np.dtype) and vcol.dtype.kind == "f":
+        arr = vcol.to_numpy()
+        ok = np.isfinite(arr) & (np.abs(arr) < 2.0 ** 63)
+        vals = np.trunc(np.where(ok, arr, 0.0)).astype(np.int64).tolist()
+        vcpu = [v if k else None for v, k in zip(vals, ok.tolist())]
+    else:
+        vcpu = [_int_or_none(x) for x in vcol.tolist()]
+
+    if isinstance(mcol.dtype, np.dtype) and mcol.dtype.kind in "iufb":
+        mem = mcol.to_numpy().astype(np.float64).tolist()
+    else:
+        mem = [_float_or_none(x) for x in mcol.tolist()]
+
+    valid = np.fromiter((v is not None and m is not None for v, m in zip(vcpu, mem)), dtype=bool, count=n)
+    v_arr = np.array([v if k else 1 for v, k in zip(vcpu, valid.tolist())], dtype=np.float64)
+    m_arr = np.array([m if k else 1.0 for m, k in zip(mem, valid.tolist())], dtype=np.float64)
+
+    # infer_profile, vectorised
+    with np.errstate(divide="ignore", invalid="ignore"):
+        per_vcpu = m_arr / v_arr
+    inferred = np.where((v_arr <= 0) | (m_arr <= 0), "balanced",
+                        np.where(per_vcpu <= 3.0, "compute",
+                                 np.where(per_vcpu >= 6.0, "memory", "balanced")))
+    if "profile" in df.columns:
+        given = df["profile"].astype(str).str.strip().str.lower().to_numpy(dtype=object)
+        prof = np.where(np.isin(given, _PROFILES), given, inferred)
+    else:
+        prof = inferred
+
+    return [(v, m, p) if k else None
+            for v, m, p, k in zip(vcpu, mem, prof.tolist(), valid.tolist())]
+
+
+def _is_missing(v) -> bool:
+    return v is None or (isinstance(v, float) and v != v)
+
+def _csv_column(values: list) -> list:
+    """
+    Cells for one column, formatted the way DataFrame.to_csv would: a column of numbers that
+    pandas stores as float64 (any float, or ints with gaps) prints every value as a float.
+    """
+    present = [v for v in values if not _is_missing(v)]
+    numeric = bool(present) and all(
+        isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_))
+        for v in present)
+    if numeric and (len(present) < len(values) or any(isinstance(v, float) for v in present)):
+        return ["" if _is_missing(v) else repr(float(v)) for v in values]
+    return ["" if _is_missing(v) else str(v) for v in values]
+
+# Cell types _csv_column formats exactly like DataFrame.to_csv
+_PLAIN_CELL_TYPES = (str, int, float, np.integer, np.floating)
+
+def _write_records_csv(path: Path, records: List[dict]) -> None:
+    """
+    Stream dict records to CSV without building a DataFrame; same bytes as pd.DataFrame(records).to_csv(index=False)
+    (columns in first-seen order, missing cells empty). Records holding anything else (Timestamp, NaT, pd.NA
+    from Excel input) are written by pandas itself.
+    """
+    import csv
+    fieldnames = list(dict.fromkeys(k for r in records for k in r))
+    _gap = object()
+    raw = [[None if (v := r.get(k, _gap)) is _gap else v for r in records] for k in fieldnames]
+    if any(v is not None and not isinstance(v, _PLAIN_CELL_TYPES) for col in raw for v in col):
+        _lazy_pandas().DataFrame(records).to_csv(path, index=False)
+        return
+    columns = [_csv_column(col) for col in raw]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f, lineterminator=os.linesep)
+        w.writerow(fieldnames)
+        w.writerows(zip(*columns))
+
+
 # ---------------------- recommend ----------------------
 @cli.command(name="recommend")
 @click.option("--in", "in_path", required=True, help="Input CSV/Excel file.")
@@ -294,20 +459,35 @@ def list_azure_regions():
 @click.option("--strict", is_flag=True, help="Fail (non-zero) if any row is rec_only or error.")
 @click.option("--validator-report", "validator_report_path", default=None,
               help="Path for validator report CSV (default: run folder).")
-@click.option("--output", "output_path", default=None, help="Output file path (CSV/Excel) for recommendations.")
-def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_path):
+@click.option("--output", "output_path", default=None, help="Output file path (CSV/Excel/Parquet) for recommendations.")
+@click.option("--format", "out_format", type=click.Choice(["csv", "xlsx", "parquet"], case_sensitive=False),
+              default="csv", show_default=True,
+              help="Format of the default recommend.* file when --output is not given. "
+                   "parquet (needs pyarrow) keeps column types for the 'price' step.")
+@click.option("--refresh-catalog", is_flag=True, help="Re-fetch the AWS/Azure instance catalog instead of using ./cache.")
+@click.option("--force-preflight", is_flag=True, help="Re-run the Azure CLI login/provider checks even if they passed recently.")
+def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_path, out_format, refresh_catalog,
+                  force_preflight):
     """
     Validate rows (no defaults). Recommend sizes for OK and REC_ONLY rows.
     Pricing is not performed here; use the 'price' command afterwards.
     """
+    pd = _lazy_pandas()
     in_path = Path(in_path)
     if not in_path.exists():
         click.echo(f"ERROR: Input file not found: {in_path}", err=True)
         sys.exit(2)
+    # Parquet output needs pyarrow: check before anything is written to the run folder
+    out_suffix = Path(output_path).suffix.lower() if output_path else f".{out_format.lower()}"
+    if out_suffix == ".parquet":
+        from importlib.util import find_spec
+        if find_spec("pyarrow") is None:
+            click.echo("ERROR: Parquet output requires pyarrow. Install with: pip install pyarrow", err=True)
+            sys.exit(2)
 
     # Load input (first sheet by default for Excel)
     if in_path.suffix.lower() in {".xlsx", ".xls"}:
-        df = pd.read_excel(in_path)
+        df = pd.read_excel(in_path, engine=excel_engine())
     else:
         df = pd.read_csv(in_path)
 
@@ -321,7 +501,7 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
     if cloud_from_str(cloud) == "azure":
         try:
             from azure_preflight import ensure_azure_ready, AzurePreflightError  # type: ignore
-            ensure_azure_ready()
+            ensure_azure_ready(force=force_preflight)
         except Exception as e:
             click.echo(f"❌ Azure preflight failed: {e}", err=True)
             sys.exit(2)
@@ -330,7 +510,7 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
     ok_idx, rec_only_idx, error_idx, report_rows = validate_dataframe(df, input_file=str(in_path))
 
     # Build default output paths in a date/timestamped run folder (unless user overrides)
-    rec_out_path, rep_out_path = _default_paths_for_recommend(output_path, validator_report_path)
+    rec_out_path, rep_out_path = _default_paths_for_recommend(output_path, validator_report_path, out_format.lower())
 
     write_validator_report(report_rows, str(rep_out_path))
 
@@ -346,15 +526,11 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
 
     # ---- Recommend (no pricing) ----
     default_cloud = cloud_from_str(cloud)
-    aws_catalog = None  # lazy
     azure_catalog_by_region: Dict[str, Dict[str, dict]] = {}
 
-    def recommend_row(row: dict) -> dict:
+    def recommend_row(row: dict, need, pick=None) -> dict:
         rid = row.get("id", "")
-        try:
-            vcpu = int(row.get("vcpu"))
-            mem_gib = float(row.get("memory_gib"))
-        except Exception:
+        if need is None:
             return {
                 **row,
                 "id": rid,
@@ -368,27 +544,11 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
                 "note": "Invalid vcpu/memory_gib",
             }
 
-        prof = (str(row.get("profile") or "").strip().lower())
-        if prof not in ("balanced", "compute", "memory"):
-            prof = infer_profile(vcpu, mem_gib)
-
+        vcpu, mem_gib, prof = need
         row_cloud = default_cloud  # enforce single-cloud run
 
-        if row_cloud == "azure":
-            az_region = normalize_azure_region(row.get("region") or "eastus")
-            if az_region not in azure_catalog_by_region:
-                azure_catalog_by_region[az_region] = fetch_azure_vm_catalog(az_region)
-            chosen = pick_azure_size(azure_catalog_by_region[az_region], vcpu, mem_gib)
-            out_region = az_region
-        else:
-            aws_region = row.get("region") or region
-            if not aws_region:
-                raise SystemExit("AWS region required for AWS recommendations. Use --region or provide per-row.")
-            nonlocal aws_catalog  # capture outer reference
-            if aws_catalog is None:
-                aws_catalog = fetch_instance_catalog(aws_region)
-            chosen = pick_instance(aws_catalog, prof, vcpu, mem_gib)
-            out_region = aws_region
+        # Picked for all rows at once below; pick = (chosen, smallest by vCPU, smallest by memory, region)
+        chosen, cpu_only, mem_only, out_region = pick
 
         overprov_vcpu = overprov_mem_gib = fit_reason = ""
         if chosen:
@@ -397,9 +557,6 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
             if chosen["vcpu"] == vcpu and round(chosen["memory_gib"], 2) == round(mem_gib, 2):
                 fit_reason = "exact"
             elif row_cloud == "aws":
-                cpu_only = smallest_meeting_cpu(aws_catalog, vcpu) if aws_catalog else None
-                mem_only = smallest_meeting_mem(aws_catalog, mem_gib) if aws_catalog else None
-
                 def rank(x): return (x["vcpu"], x["memory_gib"]) if x else (float("inf"), float("inf"))
                 if cpu_only or mem_only:
                     fit_reason = "memory-bound" if rank(mem_only) >= rank(cpu_only) else "cpu-bound"
@@ -416,7 +573,7 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
             "region": out_region,
             "recommended_instance_type": chosen["instanceType"] if chosen else "",
             "rec_vcpu": chosen["vcpu"] if chosen else "",
-            "rec_memory_gib": f'{chosen["memory_gib"]:.2f}' if chosen else "",
+            "rec_memory_gib": round(chosen["memory_gib"], 2) if chosen else "",
             "overprov_vcpu": overprov_vcpu,
             "overprov_mem_gib": overprov_mem_gib,
             "fit_reason": fit_reason,
@@ -424,30 +581,74 @@ def recommend_cmd(in_path, cloud, region, strict, validator_report_path, output_
                                        else "No matching current-gen x86_64 found; consider GPU/ARM or older-gen."),
         }
 
-    results: List[dict] = []
-    for i in ok_idx + rec_only_idx:
-        results.append(recommend_row(df.iloc[i].to_dict()))
+    sub = df.iloc[ok_idx + rec_only_idx]
+    cols = sub.columns.tolist()
+    rows = [dict(zip(cols, t)) for t in sub.itertuples(index=False, name=None)]
+    needs = _parse_needs(sub)
+
+    # One vectorised pick per catalog over every parsable row instead of a catalog scan per row
+    picks: Dict[int, tuple] = {}
+    todo = [k for k, need in enumerate(needs) if need is not None]
+    if default_cloud == "aws":
+        for k in todo:
+            if not (rows[k].get("region") or region):
+                raise SystemExit("AWS region required for AWS recommendations. Use --region or provide per-row.")
+        if todo:
+            aws_region = rows[todo[0]].get("region") or region
+            aws_catalog = catalog_arrays(fetch_instance_catalog(aws_region, refresh=refresh_catalog))
+            vcpus = [needs[k][0] for k in todo]
+            mems = [needs[k][1] for k in todo]
+            picks = dict(zip(todo, zip(
+                pick_instances(aws_catalog, [needs[k][2] for k in todo], vcpus, mems),
+                smallest_meeting_cpu_many(aws_catalog, vcpus),
+                smallest_meeting_mem_many(aws_catalog, mems),
+                [rows[k].get("region") or region for k in todo],
+            )))
+    elif todo:
+        # Azure: group rows by region so each catalog is fetched and searched once
+        by_region: Dict[str, List[int]] = {}
+        for k in todo:
+            by_region.setdefault(normalize_azure_region(rows[k].get("region") or "eastus"), []).append(k)
+        # Catalog fetches (SDK or `az` CLI calls) are independent per region: run them side by side
+        def fetch(r: str):
+            return catalog_arrays(fetch_azure_vm_catalog(r, refresh=refresh_catalog))
+
+        missing = [r for r in by_region if r not in azure_catalog_by_region]
+        if len(missing) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+                azure_catalog_by_region.update(zip(missing, ex.map(fetch, missing)))
+        else:
+            azure_catalog_by_region.update((r, fetch(r)) for r in missing)
+        for az_region, ks in by_region.items():
+            chosen = pick_azure_sizes(azure_catalog_by_region[az_region],
+                                      [needs[k][0] for k in ks], [needs[k][1] for k in ks])
+            picks.update((k, (c, None, None, az_region)) for k, c in zip(ks, chosen))
+
+    results: List[dict] = [recommend_row(row, need, picks.get(k)) for k, (row, need) in enumerate(zip(rows, needs))]
 
     if not results:
         click.echo("No valid rows to output (all rows errored). See validator report.", err=True)
         sys.exit(2)
 
-    out_df = pd.DataFrame(results)
-
     # Write to CSV or Excel at the chosen path (same run folder as validator)
     rec_out = Path(rec_out_path)
     rep_out = Path(rep_out_path)
     rec_out.parent.mkdir(parents=True, exist_ok=True)
 
     if rec_out.suffix.lower() in {".xlsx", ".xls"}:
+        out_df = pd.DataFrame(results)
         with pd.ExcelWriter(rec_out, engine="xlsxwriter") as writer:
             out_df.to_excel(writer, index=False, sheet_name="Results")
+    elif rec_out.suffix.lower() == ".parquet":
+        write_rows(str(rec_out), results, list(dict.fromkeys(k for r in results for k in r)))
     else:
-        out_df.to_csv(rec_out, index=False)
+        _write_records_csv(rec_out, results)
 
     click.echo(f"Wrote recommendations -> {rec_out}")
     click.echo(f"Wrote validator report -> {rep_out}")
 
+    write_run_summary, _ = _summary_funcs()
     if write_run_summary:
         try:
             run_dir = Path(rec_out).parent
@@ -464,6 +665,7 @@ def validate_cmd(in_path, output_path, strict):
     """
     Validate input rows and write a validator report CSV. Does not recommend or price.
     """
+    pd = _lazy_pandas()
     in_path = Path(in_path)
     if not in_path.exists():
         click.echo(f"ERROR: Input file not found: {in_path}", err=True)
@@ -471,7 +673,7 @@ def validate_cmd(in_path, output_path, strict):
 
     # Load input (first sheet by default for Excel)
     if in_path.suffix.lower() in {".xlsx", ".xls"}:
-        df = pd.read_excel(in_path)
+        df = pd.read_excel(in_path, engine=excel_engine())
     else:
         df = pd.read_csv(in_path)
 
@@ -494,11 +696,43 @@ def validate_cmd(in_path, output_path, strict):
         sys.exit(2)
 
 # ---------------------- price ----------------------
+_LICENSE_INCLUDED = frozenset({"license_included", "license-included"})
+# Compute-only EC2 families -> closest RDS family when db_instance_class is derived from the instance type
+_RDS_FAMILY_FALLBACK = {
+    "c7i": "m7i", "c7g": "m7g",
+    "c6i": "m6i", "c6g": "m6g",
+    "c5": "m5",   "c5n": "m5", "c4": "m4",
+}
+# RDS SQL Server isn't offered on some 7-series families yet
+_RDS_SQLSERVER_FAMILY_DOWN = {"m7i": "m6i", "r7i": "r6i", "m7g": "m6i", "r7g": "r6i"}
+# Leading columns of the priced output, in this order; any other columns follow alphabetically
+_PRICE_COLUMN_ORDER = (
+    "id", "name", "cloud", "region", "environment", "profile",
+    "recommended_instance_type", "instance_type",
+    "db_engine", "db_instance_class", "resolved_db_instance_class",
+    "license_model", "multi_az",
+    "vcpu", "memory_gib", "ebs_gb", "ebs_type", "s3_gb", "network_profile",
+    "provider", "price_per_hour_usd", "monthly_compute_usd", "monthly_ebs_usd",
+    "monthly_s3_usd", "monthly_network_usd", "monthly_db_usd",
+    "monthly_total_usd", "pricing_note",
+)
+_PRICE_COLUMN_SET = frozenset(_PRICE_COLUMN_ORDER)
+_AZ_SQL_DEPLOYMENTS = frozenset({"single", "mi"})
+_AHUB_LICENSES = frozenset({"BYOL", "AHUB"})
+
+def _first_present(r: dict, *names):
+    """First of the given columns with a non-blank value in row r, else None."""
+    for n in names:
+        v = r.get(n)
+        if v not in (None, ""):
+            return v
+    return None
+
 @cli.command(name="price")
 @click.option("--cloud", type=click.Choice(["aws", "azure"], case_sensitive=False), required=True,
               help="Cloud of the recommendation file to be priced.")
 @click.option("--in", "in_path", required=False,
-              help="Recommendation CSV/Excel to price. If omitted, will use --latest.")
+              help="Recommendation CSV/Excel/Parquet to price. If omitted, will use --latest.")
 @click.option("--latest", is_flag=True, help="Use the most recent recommend file from ./output (nested folders supported).")
 @click.option("--region", required=False, help="Default AWS region if missing in rows (e.g., us-east-1).")
 @click.option("--os", "os_name", type=click.Choice(["Linux", "Windows", "RHEL", "SUSE"], case_sensitive=False),
@@ -508,10 +742,12 @@ def validate_cmd(in_path, output_path, strict):
 @click.option("--refresh-azure-prices", is_flag=True, help="Refresh Azure Retail Prices cache before pricing (if supported).")
 @click.option("--output", "output_path", default=None, help="Output file path (CSV/Excel).")
 @click.option("--no-auto-recommend", is_flag=True, default=False, help="Disable automatic recommendation for missing required fields; fail instead.")
-def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_monthly, refresh_azure_prices, output_path, no_auto_recommend):
+@click.option("--refresh-catalog", is_flag=True, help="Re-fetch the AWS/Azure instance catalog used by auto-recommend instead of using ./cache.")
+def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_monthly, refresh_azure_prices, output_path, no_auto_recommend, refresh_catalog):
     """
     Price the recommendation output. Enforces single-cloud file matching the --cloud argument.
     """
+    pd = _lazy_pandas()
     expected_cloud = cloud_from_str(cloud)
 
     # --- Resolve input recommend file ---
@@ -566,11 +802,6 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                 "Price with the matching --cloud or re-run 'recommend' for a single cloud."
             )
 
-    # --- Read and validate rows ---
-    rows = read_rows(str(rec_path), sheet=None)
-    if not rows:
-        raise SystemExit("❌ Input file has no rows.")
-
     # Auto-recommend missing fields unless --no-auto-recommend
     if not no_auto_recommend:
         def needs_reco(r: dict) -> bool:
@@ -583,7 +814,7 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                 if not r.get("db_storage_gb"):
                     return True
                 lic = (r.get("license_model") or "").strip().lower()
-                if lic and lic not in {"license_included", "license-included"}:
+                if lic and lic not in _LICENSE_INCLUDED:
                     return True
             # Also, for regular VM compute pricing we need an instance type
             itype = r.get("recommended_instance_type") or r.get("instance_type")
@@ -595,7 +826,7 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
         if any(mask):
             import pandas as _pd
             from recommender import (
-                infer_profile, fetch_instance_catalog, pick_instance,
+                infer_profile, fetch_instance_catalog, catalog_arrays, pick_instance,
                 fetch_azure_vm_catalog, pick_azure_size, normalize_azure_region
             )
 
@@ -627,7 +858,7 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                 if not aws_region:
                     raise SystemExit("AWS region required for auto-recommend. Use --region or provide per-row.")
 
-                cat = fetch_instance_catalog(str(aws_region))
+                cat = catalog_arrays(fetch_instance_catalog(str(aws_region), refresh=refresh_catalog))
 
 
                 def _reco_row(r):
@@ -646,11 +877,14 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                 to_fix = to_fix.apply(_reco_row, axis=1)
 
             else:  # azure
+                az_cats: Dict[str, object] = {}
                 def _reco_row(r):
                     vcpu = int(float(r.get("vcpu", 0)))
                     mem  = float(r.get("memory_gib", 0.0))
                     azr  = normalize_azure_region(r.get("region") or "eastus")
-                    cat  = fetch_azure_vm_catalog(azr)
+                    if azr not in az_cats:
+                        az_cats[azr] = catalog_arrays(fetch_azure_vm_catalog(azr, refresh=refresh_catalog))
+                    cat  = az_cats[azr]
                     chosen = pick_azure_size(cat, vcpu, mem)
                     r["region"] = azr
                     r["recommended_instance_type"] = chosen["instanceType"] if chosen else r.get("recommended_instance_type","")
@@ -678,49 +912,112 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
             if "sql" in dbeng and "server" in dbeng:
                 if not r.get("db_instance_class"):
                     bad.append(("missing db_instance_class for RDS SQL Server", r.get("id","")))
-                if lic and lic not in {"license_included","license-included"}:
+                if lic and lic not in _LICENSE_INCLUDED:
                     bad.append(("RDS SQL Server requires license_included", r.get("id","")))
         if bad:
             msg = "\n".join(f"- {why} (row id: {rid})" for why, rid in bad)
             raise SystemExit("Strict mode (--no-auto-recommend) failed:\n" + msg)
 
 
+    # --- Prefetch EC2 prices once per unique (instance_type, region, os) ---
+    ec2_prices: Dict[tuple, Optional[float]] = {}
+    if expected_cloud == "aws":
+        ec2_keys = []
+        for r in rows:
+            itype = r.get("recommended_instance_type") or r.get("instance_type") or ""
+            region_row = r.get("region") or region
+            if not itype or not region_row:
+                continue
+            os_row = (r.get("os") or os_name or "Linux").strip()
+            license_model = (r.get("license_model") or "AWS").strip()
+            os_for_compute = "Linux" if license_model.lower() == "byol" else os_row
+            ec2_keys.append((itype, str(region_row), os_for_compute))
+        ec2_prices = prefetch_ec2_prices(ec2_keys)
+
+        # RDS prices come from one table per (engine, region, license, deployment); pull those concurrently
+        if not no_monthly:
+            prefetch_rds_prices(
+                ((r.get("db_engine") or "").strip(), str(r.get("region") or region),
+                 (r.get("license_model") or "AWS").strip(), as_bool(r.get("multi_az"), False))
+                for r in rows
+                if (r.get("db_engine") or "").strip() and (r.get("region") or region)
+            )
+
     # --- Pricing loop ---
-    out_rows: List[dict] = []
-    for r in rows:
-        row_cloud = expected_cloud
+    # Rows are priced in place (the output is the input rows plus price columns), so no second list is
+    # built; the column union for the writer is collected in the same pass.
+    fn_set: set = set()
+    hours = float(hours_per_month)
+    # Azure hourly price per (region, sku, os, license): duplicate rows reuse it instead of
+    # re-reading the price cache file (and re-querying the Retail API on a miss) every time.
+    # Unique keys are priced concurrently up front; the loop only computes what that missed.
+    azure_prices: Dict[tuple, float] = {}
+    if expected_cloud == "azure" and prefetch_azure_vm_prices is not None:
+        az_keys = []
+        for r in rows:
+            itype = r.get("recommended_instance_type") or r.get("instance_type") or ""
+            region_row = r.get("region") or region or "eastus"
+            if not itype:
+                continue
+            os_row = (r.get("os") or os_name or "Linux").strip()
+            license_model = (r.get("license_model") or "BYOL").strip()
+            os_for_compute = "Linux" if license_model.lower() == "byol" else os_row
+            az_keys.append((str(region_row), itype, os_for_compute, license_model))
+        azure_prices = prefetch_azure_vm_prices(az_keys, refresh=refresh_azure_prices)
+    azure_sql_costs: Dict[tuple, float] = {}  # same idea for Azure SQL monthly cost
+    if not no_monthly:
+        # Storage and network monthlies only depend on their own columns: compute them column-wise
+        ebs_costs, s3_costs, net_costs = monthly_storage_network_costs(
+            [as_float(r.get("ebs_gb"), 0.0) for r in rows],
+            [(r.get("ebs_type") or "gp3").strip().lower() for r in rows],
+            [as_float(r.get("s3_gb"), 0.0) for r in rows],
+            [(r.get("network_profile") or "").strip().lower() for r in rows],
+        )
+    # Cloud-dependent defaults and the compute pricer are fixed for the run (single-cloud), so the
+    # loop below calls straight through instead of re-testing the cloud on every row.
+    # Each pricer returns (hourly price, pricing_note or None to keep the row's own note).
+    def _azure_compute_price(itype: str, region_s: str, os_c: str, lic: str):
+        if azure_vm_price_hourly is None:
+            raise SystemExit("❌ Azure pricing function not available: pricing.azure_vm_price_hourly")
+        az_key = (region_s, itype, os_c, lic)
+        if az_key not in azure_prices:
+            azure_prices[az_key] = azure_vm_price_hourly(region_s, itype, os_c, lic, refresh=refresh_azure_prices)
+        return azure_prices[az_key], None
+
+    def _aws_compute_price(itype: str, region_s: str, os_c: str, lic: str):
+        key = (itype, region_s, os_c)
+        price = ec2_prices[key] if key in ec2_prices else price_ec2_ondemand(itype, region_s, os_name=os_c)
+        return price, (None if price is not None else "No EC2 price found (check filters/region/OS)")
+
+    is_azure = expected_cloud == "azure"
+    compute_pricer = _azure_compute_price if is_azure else _aws_compute_price
+    default_region = region or ("eastus" if is_azure else None)
+    default_license = "BYOL" if is_azure else "AWS"
+
+    for i, r in enumerate(rows):
         r["cloud"] = expected_cloud  # make explicit in output
 
         itype = r.get("recommended_instance_type") or r.get("instance_type") or ""
-        region_row = (r.get("region") or region or ("eastus" if row_cloud == "azure" else None))
+        region_row = r.get("region") or default_region
         os_row = (r.get("os") or os_name or "Linux").strip()
-        license_model = (r.get("license_model") or ("AWS" if row_cloud == "aws" else "BYOL")).strip()
+        license_model = (r.get("license_model") or default_license).strip()
+        is_byol = license_model.lower() == "byol"
 
         # BYOL → treat compute as Linux price component
-        os_for_compute = "Linux" if license_model.lower() == "byol" else os_row
+        os_for_compute = "Linux" if is_byol else os_row
 
         # Compute hourly price
         if not itype or not region_row:
             compute_price = None
             r["pricing_note"] = "Missing instance_type or region"
         else:
-            if row_cloud == "azure":
-                if azure_vm_price_hourly is None:
-                    raise SystemExit("❌ Azure pricing function not available: pricing.azure_vm_price_hourly")
-                compute_price = azure_vm_price_hourly(
-                    str(region_row), itype, os_for_compute, license_model, refresh=refresh_azure_prices
-                )
-                r["pricing_note"] = r.get("pricing_note", "")
-            else:
-                compute_price = price_ec2_ondemand(itype, str(region_row), os_name=os_for_compute)
-                r["pricing_note"] = r.get("pricing_note", "") if compute_price is not None else \
-                    "No EC2 price found (check filters/region/OS)"
+            compute_price, note = compute_pricer(itype, str(region_row), os_for_compute, license_model)
+            r["pricing_note"] = r.get("pricing_note", "") if note is None else note
 
         # Persist OS for downstream reporting
         r["os"] = os_row
 
         # Monthly math
-        hours = float(hours_per_month)
         compute_monthly = monthly_compute_cost(compute_price, hours)
 
         if no_monthly:
@@ -731,18 +1028,10 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
             r["price_per_hour_usd"] = f"{compute_price:.6f}" if compute_price is not None else ""
             r["monthly_compute_usd"] = f"{compute_monthly:.2f}"
 
-            ebs_gb = as_float(r.get("ebs_gb"), 0.0)
-            ebs_type = (r.get("ebs_type") or "gp3").strip()
-            s3_gb = as_float(r.get("s3_gb"), 0.0)
-            net_prof = (r.get("network_profile") or "").strip()
-
-            r["monthly_ebs_usd"] = f"{monthly_ebs_cost(ebs_gb, ebs_type):.2f}"
-            r["monthly_s3_usd"] = f"{monthly_s3_cost(s3_gb):.2f}"
-            r["monthly_network_usd"] = f"{monthly_network_cost(net_prof):.2f}"
-
-            def _normalize_rds_class(cls: str) -> str:
-                cls = str(cls or "").strip()
-                return cls if cls.startswith("db.") else (f"db.{cls}" if cls else cls)
+            ebs_monthly, s3_monthly, net_monthly = ebs_costs[i], s3_costs[i], net_costs[i]
+            r["monthly_ebs_usd"] = f"{ebs_monthly:.2f}"
+            r["monthly_s3_usd"] = f"{s3_monthly:.2f}"
+            r["monthly_network_usd"] = f"{net_monthly:.2f}"
 
             # ----- Database monthly cost -----
             # --- inside the AWS DB monthly cost block in main.py ---
@@ -764,21 +1053,15 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                     cand = candidate[3:] if candidate.startswith("db.") else candidate
                     fam, _, size = cand.partition(".")
                     eng_l = db_engine.lower()
-                    fam_l = fam.lower()
 
                     # 1) General fallback: map compute-only families to closest RDS families
                     #    This helps Postgres/MySQL too (not just SQL Server).
-                    general_fallback = {
-                        "c7i": "m7i", "c7g": "m7g",
-                        "c6i": "m6i", "c6g": "m6g",
-                        "c5": "m5",   "c5n": "m5", "c4": "m4",
-                    }
-                    fam2 = general_fallback.get(fam_l, fam)
+                    fam2 = _RDS_FAMILY_FALLBACK.get(fam.lower(), fam)
 
                     # 2) SQL Server special fallback (some 7-series aren’t offered yet)
                     if "sql" in eng_l and "server" in eng_l:
-                        down = {"m7i":"m6i", "r7i":"r6i", "m7g":"m6i", "r7g":"r6i"}
-                        fam2 = down.get(fam2.lower(), ("m6i" if fam2.lower().startswith("c") else fam2))
+                        fam2_l = fam2.lower()
+                        fam2 = _RDS_SQLSERVER_FAMILY_DOWN.get(fam2_l, ("m6i" if fam2_l.startswith("c") else fam2))
 
                     db_class = f"db.{fam2}.{size}" if size else f"db.{fam2}"
 
@@ -789,74 +1072,54 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
                 db_monthly = 0.0
 
 
-                # Azure SQL DB/Managed Instance (Option B)
-                def _first(*names):
-                    for n in names:
-                        v = r.get(n)
-                        if v not in (None, ""):
-                            return v
-                    return None
-
-                az_dep = (str(_first("az_sql_deployment", "db_deployment") or "")).strip().lower()  # "single" | "mi"
-                if az_dep in {"single", "mi"}:
-                    az_tier    = (str(_first("az_sql_tier", "db_tier") or "GeneralPurpose")).strip()
-                    az_family  = (str(_first("az_sql_family", "db_family") or "")).strip() or None  # e.g., "Gen5" or blank
-                    az_vcores  = as_float(_first("az_sql_vcores", "db_vcores"), 0.0)
+                # Azure SQL DB/Managed Instance (Option B); rows without a deployment stop at this lookup
+                az_dep = _first_present(r, "az_sql_deployment", "db_deployment")
+                az_dep = str(az_dep).strip().lower() if az_dep is not None else ""  # "single" | "mi"
+                if az_dep in _AZ_SQL_DEPLOYMENTS:
+                    az_tier    = (str(_first_present(r, "az_sql_tier", "db_tier") or "GeneralPurpose")).strip()
+                    az_family  = (str(_first_present(r, "az_sql_family", "db_family") or "")).strip() or None  # e.g., "Gen5" or blank
+                    az_vcores  = as_float(_first_present(r, "az_sql_vcores", "db_vcores"), 0.0)
                     # IMPORTANT: use your shared column here
-                    az_storage = as_float(_first("az_sql_storage_gb", "db_storage_gb"), 0.0)
+                    az_storage = as_float(_first_present(r, "az_sql_storage_gb", "db_storage_gb"), 0.0)
 
                     # Prefer explicit Azure-style license model; else map generic license_model
-                    lic_raw = (str(_first("az_sql_license_model", "license_model") or "LicenseIncluded")).strip()
+                    lic_raw = (str(_first_present(r, "az_sql_license_model", "license_model") or "LicenseIncluded")).strip()
                     # Map BYOL -> AHUB for Azure SQL semantics
-                    az_lic = "AHUB" if lic_raw.upper() in {"BYOL", "AHUB"} else "LicenseIncluded"
+                    az_lic = "AHUB" if lic_raw.upper() in _AHUB_LICENSES else "LicenseIncluded"
 
                     if (az_vcores > 0 or az_storage > 0) and region_row:
-                        try:
-                            db_monthly += monthly_azure_sql_cost(
-                                "mi" if az_dep == "mi" else "single",
-                                str(region_row),
-                                az_tier,
-                                az_family,
-                                az_vcores,
-                                az_storage,  # includes backup/storage in our model
-                                az_lic,
-                                hours,
-                            )
-                        except Exception:
-                            pass  # keep pricing robust
+                        sql_key = (
+                            "mi" if az_dep == "mi" else "single",
+                            str(region_row),
+                            az_tier,
+                            az_family,
+                            az_vcores,
+                            az_storage,  # includes backup/storage in our model
+                            az_lic,
+                            hours,
+                        )
+                        if sql_key not in azure_sql_costs:
+                            try:
+                                azure_sql_costs[sql_key] = monthly_azure_sql_cost(*sql_key)
+                            except Exception:
+                                azure_sql_costs[sql_key] = 0.0  # keep pricing robust
+                        db_monthly += azure_sql_costs[sql_key]
 
 
             r["monthly_db_usd"] = f"{db_monthly:.2f}"
-            parts = [
-                as_float(r["monthly_compute_usd"]),
-                as_float(r["monthly_ebs_usd"]),
-                as_float(r["monthly_s3_usd"]),
-                as_float(r["monthly_network_usd"]),
-                as_float(r["monthly_db_usd"]),
-            ]
-            r["monthly_total_usd"] = f"{sum(parts):.2f}"
-
-        r["provider"] = row_cloud
-        out_rows.append(r)
+            # Sum the floats (each rounded to cents, as the formatted columns are) rather than re-parsing the strings
+            parts = (compute_monthly, ebs_monthly, s3_monthly, net_monthly, db_monthly)
+            r["monthly_total_usd"] = f"{sum(round(x, 2) for x in parts):.2f}"
+
+        r["provider"] = expected_cloud
+        fn_set.update(r)
+    out_rows = rows
 
     # --- Write file ---
-    # Build fieldnames from the union of keys across all rows so DictWriter won't choke
-    fn_set = set()
-    for r in out_rows:
-        fn_set.update(r.keys())
+    # fieldnames are the union of keys across all rows so DictWriter won't choke
 
     # Keep a readable order for common columns, then append any others
-    preferred_order = [
-        "id", "name", "cloud", "region", "environment", "profile",
-        "recommended_instance_type", "instance_type",
-        "db_engine", "db_instance_class", "resolved_db_instance_class",
-        "license_model", "multi_az",
-        "vcpu", "memory_gib", "ebs_gb", "ebs_type", "s3_gb", "network_profile",
-        "provider", "price_per_hour_usd", "monthly_compute_usd", "monthly_ebs_usd",
-        "monthly_s3_usd", "monthly_network_usd", "monthly_db_usd",
-        "monthly_total_usd", "pricing_note"
-    ]
-    fieldnames = [c for c in preferred_order if c in fn_set] + [c for c in sorted(fn_set) if c not in preferred_order]
+    fieldnames = [c for c in _PRICE_COLUMN_ORDER if c in fn_set] + sorted(fn_set - _PRICE_COLUMN_SET)
 
     out_path = Path(price_out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
@@ -872,6 +1135,7 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
     except Exception as e:
         print(f"⚠️ Excel workbook generation skipped: {e}")
 
+    write_run_summary, prompt_and_update_tracking = _summary_funcs()
     if write_run_summary:
         try:
             run_dir = Path(out_path).parent
@@ -888,18 +1152,16 @@ def price_cmd(cloud, in_path, latest, region, os_name, hours_per_month, no_month
             print(f"⚠️ Tracking prompt failed: {e}")
 
 # ---------------------- Excel output helpers ----------------------
+_SHEET_TRANS = str.maketrans({c: "-" for c in '[]:*?/\\'})
+
 def _sanitize_sheet_name(name: str) -> str:
-    bad = '[]:*?/\\'
-    s = str(name or "").strip() or "Unspecified"
-    for ch in bad:
-        s = s.replace(ch, "-")
-    if len(s) > 31:
-        s = s[:31]
-    if s.startswith("'") or s.endswith("'"):
+    s = (str(name or "").strip() or "Unspecified").translate(_SHEET_TRANS)[:31]
+    if s[:1] == "'" or s[-1:] == "'":
         s = s.strip("'")
     return s or "Unspecified"
 
 def _autosize_and_style(writer, df, sheet_name: str):
+    pd = _lazy_pandas()
     ws = writer.sheets[sheet_name]
     try:
         bold = writer.book.add_format({"bold": True})
@@ -912,7 +1174,8 @@ def _autosize_and_style(writer, df, sheet_name: str):
         pass
     for idx, col in enumerate(df.columns):
         try:
-            max_len = max(len(str(col)), *(len(str(x)) for x in df[col].astype(str).tolist()))
+            longest = df.iloc[:, idx].astype(str).str.len().max()
+            max_len = max(len(str(col)), 0 if pd.isna(longest) else int(longest))
             ws.set_column(idx, idx, min(max_len + 2, 60))
         except Exception:
             continue
@@ -925,6 +1188,7 @@ def _detect_environment_column(df) -> str | None:
 
 # ---------------------- Excel output helpers ----------------------
 def _write_pricing_excel_workbook(price_csv_path: Path, all_rows_df: pd.DataFrame):
+    pd = _lazy_pandas()
     out_xlsx = price_csv_path.with_suffix(".xlsx")
     run_dir = price_csv_path.parent
     summary_csv = run_dir / "summary.csv"
@@ -943,17 +1207,18 @@ def _write_pricing_excel_workbook(price_csv_path: Path, all_rows_df: pd.DataFram
 
         # Per-environment tabs (if any)
         if env_series is not None:
-            for env_value in sorted(set(env_series)):
-                sub = all_rows_df[env_series == env_value]
-                sheet = _sanitize_sheet_name(env_value)
-                used = set(k for k in writer.sheets.keys())
-                if sheet in used:
-                    base = sheet
-                    i = 2
-                    while sheet in used and i < 100:
-                        suffix = f"_{i}"
-                        sheet = (base[:31-len(suffix)] + suffix)[:31]
-                        i += 1
+            # Row positions per environment in one grouping pass (no boolean scan per environment)
+            env_rows = env_series.groupby(env_series, sort=False).indices
+            used = set(writer.sheets)
+            for env_value in sorted(env_rows):
+                sub = all_rows_df.iloc[env_rows[env_value]]
+                sheet = base = _sanitize_sheet_name(env_value)
+                for i in itertools.count(2):
+                    if sheet not in used:
+                        break
+                    suffix = f"_{i}"
+                    sheet = (base[:31-len(suffix)] + suffix)[:31]
+                used.add(sheet)
                 sub.to_excel(writer, index=False, sheet_name=sheet)
                 _autosize_and_style(writer, sub, sheet)
 
@@ -1044,6 +1309,7 @@ def _build_exec_summary(df: pd.DataFrame) -> pd.DataFrame:
     - Extra lines: Storage (block + object) and Network, summed once across all rows.
     - Adds Annual Cost and a Total row.
     """
+    pd = _lazy_pandas()
     df = df.copy()
 
     # Normalize numeric columns we’ll aggregate
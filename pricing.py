@@ -1,8 +1,8 @@
 # pricing.py
-import csv, sys, json, os
+import csv, sys, json, os, io, functools, tempfile, threading
 from pathlib import Path
 from typing import Optional, List
-import time, requests
+import time
 from typing import Dict, Tuple
 
 # ---------- Cost model defaults ----------
@@ -60,7 +60,7 @@ def _autosize_and_style_excel(writer, df, sheet_name: str = "Results") -> None:
             # sample first 500 rows to keep it quick
             sample = df[col].astype(str).head(500)
             if not sample.empty:
-                w = max(w, sample.map(lambda s: len(s)).max() + 1)
+                w = max(w, sample.str.len().max() + 1)
             widths.append(min(w, 60))  # cap
         for idx, w in enumerate(widths):
             ws.set_column(idx, idx, w)
@@ -68,26 +68,132 @@ def _autosize_and_style_excel(writer, df, sheet_name: str = "Results") -> None:
         # Best-effort only
         pass
 
+_CSV_SUFFIX = ".csv"
+_EXCEL_SUFFIXES = frozenset({".xlsx", ".xls"})
+_PARQUET_SUFFIX = ".parquet"
+
+def _lazy_parquet():
+    # Parquet files need pyarrow (pip install pyarrow); unlike the CSV fast path there is no fallback.
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+        return pa, pq
+    except ImportError:
+        print("Parquet files require pyarrow. Install with: pip install pyarrow", file=sys.stderr)
+        sys.exit(1)
+
+def _parquet_column(pa, values: list):
+    """
+    Arrow array for one output column: blanks/NaN become nulls so numeric columns keep their type;
+    columns that mix numbers and text (e.g. rec_vcpu with "" for unmatched rows) fall back to strings.
+    """
+    vals = [None if (v is None or (isinstance(v, str) and not v) or (isinstance(v, float) and v != v)) else v
+            for v in values]
+    try:
+        return pa.array(vals)
+    except Exception:
+        return pa.array([None if v is None else str(v) for v in vals], type=pa.string())
+
+def _read_csv_pyarrow(p: Path) -> Optional[List[dict]]:
+    """
+    Multi-threaded CSV parse via pyarrow (optional). Every column is read as a string with
+    blanks kept as "" so rows look exactly like csv.DictReader output. None => use DictReader.
+    """
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.csv as pac  # type: ignore
+    except ImportError:
+        return None
+    try:
+        with open(p, newline="", encoding="utf-8") as f:
+            names = next(csv.reader(f), [])
+        if not names or len(set(names)) != len(names):
+            return None
+        # Pass the header names as read above: Arrow would strip a UTF-8 BOM from the first one,
+        # while DictReader (and the column_types keys) keep it
+        tbl = pac.read_csv(
+            p,
+            read_options=pac.ReadOptions(block_size=1 << 20, skip_rows=1, column_names=names),
+            parse_options=pac.ParseOptions(newlines_in_values=True),
+            convert_options=pac.ConvertOptions(
+                column_types={n: pa.string() for n in names},
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False,
+            ),
+        )
+        return tbl.to_pylist()
+    except Exception:
+        return None  # ragged/odd files: let DictReader handle them as before
+
+def _write_csv_pyarrow(p: Path, rows: List[dict], fieldnames: List[str]) -> bool:
+    """
+    Serialize rows with pyarrow's C++ CSV writer (optional). Cells are written unquoted with CRLF
+    endings, byte-for-byte what csv.writer produces for them; any value that would need quoting
+    makes pyarrow raise, and we return False so the stdlib writer handles the file instead.
+    """
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.csv as pac  # type: ignore
+    except ImportError:
+        return False
+    try:
+        cols = [pa.array(["" if (v := r.get(k, "")) is None else str(v) for r in rows], type=pa.string())
+                for k in fieldnames]
+        buf = io.BytesIO()
+        pac.write_csv(
+            pa.Table.from_arrays(cols, names=list(fieldnames)), buf,
+            write_options=pac.WriteOptions(quoting_style="none", quoting_header="none", eol="\r\n"),
+        )
+    except Exception:
+        return False
+    p.write_bytes(buf.getvalue())
+    return True
+
+def excel_engine() -> Optional[str]:
+    # calamine (pip install python-calamine) parses workbooks far faster than openpyxl.
+    # pandas only accepts engine="calamine" from 2.2 on; older versions keep the default engine.
+    try:
+        import python_calamine  # type: ignore  # noqa: F401
+    except ImportError:
+        return None
+    ver = _lazy_pandas().__version__.split(".")
+    try:
+        return "calamine" if (int(ver[0]), int(ver[1])) >= (2, 2) else None
+    except (IndexError, ValueError):
+        return None
+
 def read_rows(path: str, sheet: Optional[str] = None) -> List[dict]:
     p = Path(path); suffix = p.suffix.lower()
-    if suffix == ".csv":
+    if suffix == _CSV_SUFFIX:
+        rows = _read_csv_pyarrow(p)
+        if rows is not None:
+            return rows
         with open(p, newline="", encoding="utf-8") as f:
             return list(csv.DictReader(f))
-    elif suffix in {".xlsx",".xls"}:
+    elif suffix in _EXCEL_SUFFIXES:
         pd = _lazy_pandas()
         try:
-            df = pd.read_excel(p, sheet_name=sheet if sheet is not None else 0)
+            df = pd.read_excel(p, sheet_name=sheet if sheet is not None else 0, engine=excel_engine())
         except Exception as e:
             print(f"❌ Failed to read Excel file: {e}", file=sys.stderr); sys.exit(1)
         df.columns = [str(c).strip() for c in df.columns]
-        return df.to_dict(orient="records")
+        # Blank cells come back as NaN/NaT; make them "" like the CSV readers so callers can .strip()
+        return df.astype(object).where(df.notna(), "").to_dict(orient="records")
+    elif suffix == _PARQUET_SUFFIX:
+        pa, pq = _lazy_parquet()
+        # Same row contract as the CSV readers (str cells, "" for blanks); str() of the stored
+        # int/float/bool values is what DataFrame.to_csv would have written for them.
+        cols = pq.read_table(p).to_pydict()
+        for name, vals in cols.items():
+            cols[name] = ["" if v is None else v if isinstance(v, str) else str(v) for v in vals]
+        return [dict(zip(cols, cells)) for cells in zip(*cols.values())]
     else:
-        print("❌ Unsupported input file format (use .csv, .xlsx, or .xls)", file=sys.stderr)
+        print("❌ Unsupported input file format (use .csv, .xlsx, .xls, or .parquet)", file=sys.stderr)
         sys.exit(1)
 
 def write_rows(path: str, rows: List[dict], fieldnames: List[str]) -> None:
     p = Path(path); suff = p.suffix.lower()
-    if suff in {".xlsx", ".xls"}:
+    if suff in _EXCEL_SUFFIXES:
         pd = _lazy_pandas()
         frame = pd.DataFrame(rows, columns=fieldnames)
         try:
@@ -98,20 +204,46 @@ def write_rows(path: str, rows: List[dict], fieldnames: List[str]) -> None:
             # fallback without styling
             frame.to_excel(p, index=False, sheet_name="Results")
         return
+    if suff == _PARQUET_SUFFIX:
+        pa, pq = _lazy_parquet()
+        table = pa.table({k: _parquet_column(pa, [r.get(k) for r in rows]) for k in fieldnames})
+        pq.write_table(table, p, compression="zstd")
+        return
+    if _write_csv_pyarrow(p, rows, fieldnames):
+        return
     with open(p, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        # Align each row to fieldnames once and hand the whole batch to the C writer.
+        w.writerows([r.get(k, "") for k in fieldnames] for r in rows)
 
 # ---------- AWS pricing ----------
+_BOTO3 = None
+
 def _lazy_boto3():
+    global _BOTO3
+    if _BOTO3 is None:
+        try:
+            import boto3
+        except ImportError:
+            print("This feature requires boto3. Install with: pip install boto3", file=sys.stderr)
+            sys.exit(1)
+        _BOTO3 = boto3
+    return _BOTO3
+
+try:
+    import orjson  # type: ignore  # optional: much faster PriceList parsing
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def _lazy_ijson():
+    # Optional: pip install ijson to stream-parse Price List blobs.
     try:
-        import boto3
-        return boto3
+        import ijson  # type: ignore
+        return ijson
     except ImportError:
-        print("This feature requires boto3. Install with: pip install boto3", file=sys.stderr)
-        sys.exit(1)
+        return None
 
 AWS_REGION_TO_LOCATION = {
     "us-east-1": "US East (N. Virginia)", "us-east-2": "US East (Ohio)",
@@ -132,8 +264,66 @@ AWS_REGION_TO_LOCATION = {
     "us-gov-east-1": "AWS GovCloud (US-East)",
 }
 
+@functools.lru_cache(maxsize=1)
+def _boto_config():
+    # Bigger pool + keepalive so concurrent lookups reuse warm TLS connections.
+    # botocore always sets TCP_NODELAY on its sockets; tcp_keepalive adds SO_KEEPALIVE.
+    from botocore.config import Config  # ships with boto3
+    return Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+        retries={"mode": "adaptive", "max_attempts": 5},
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_pricing_client():
+    # The Price List API is only served from a few regions; one client is reused for all lookups.
+    boto3 = _lazy_boto3()
+    return boto3.client("pricing", region_name=os.getenv("AWS_PRICING_REGION", "us-east-1"),
+                        config=_boto_config())
+
+def _pricelist_first_usd(pl: str) -> Optional[float]:
+    """
+    First on-demand USD price in a raw PriceList JSON string.
+    With ijson installed the blob is streamed and parsing stops at the first usable dimension;
+    otherwise the whole blob is parsed (orjson when available) and handed to _pricing_first_usd.
+    """
+    ijson = _lazy_ijson()
+    if ijson is None:
+        return _pricing_first_usd(_loads(pl))
+    dims: Dict[str, list] = {}  # dimension prefix -> [unit, usd]
+    for prefix, _event, value in ijson.parse(io.BytesIO(pl.encode("utf-8"))):
+        if not prefix.startswith("terms.OnDemand.") or ".priceDimensions." not in prefix:
+            continue
+        if prefix.endswith(".unit"):
+            d = dims.setdefault(prefix[:-len(".unit")], [None, None]); d[0] = value
+        elif prefix.endswith(".pricePerUnit.USD"):
+            d = dims.setdefault(prefix[:-len(".pricePerUnit.USD")], [None, None]); d[1] = value
+        else:
+            continue
+        unit, usd = d
+        if usd and unit in {"Hrs","Quantity"}:
+            try: return float(usd)
+            except Exception: pass
+    return None
+
 def _pricing_first_usd(pl_obj: dict) -> Optional[float]:
-    for term in pl_obj.get("terms", {}).get("OnDemand", {}).values():
+    od = pl_obj.get("terms", {}).get("OnDemand")
+    if not od:
+        return None
+    if len(od) == 1:
+        # Usual shape: one OnDemand term with one price dimension -- read it without the nested walk.
+        dims = next(iter(od.values())).get("priceDimensions") or {}
+        if len(dims) == 1:
+            dim = next(iter(dims.values()))
+            usd = dim.get("pricePerUnit", {}).get("USD")
+            if usd and dim.get("unit") in {"Hrs","Quantity"}:
+                try: return float(usd)
+                except Exception: pass
+            return None
+    for term in od.values():
         for dim in term.get("priceDimensions", {}).values():
             usd = dim.get("pricePerUnit", {}).get("USD")
             unit = dim.get("unit")
@@ -142,28 +332,178 @@ def _pricing_first_usd(pl_obj: dict) -> Optional[float]:
                 except Exception: pass
     return None
 
+# Filters shared by every EC2 on-demand query; built once (botocore only reads request params).
+_EC2_BASE_FILTERS = (
+    {"Type":"TERM_MATCH","Field":"tenancy","Value":"Shared"},
+    {"Type":"TERM_MATCH","Field":"preInstalledSw","Value":"NA"},
+    {"Type":"TERM_MATCH","Field":"capacitystatus","Value":"Used"},
+)
+
+def _ec2_filters(location: str, os_name: str, instance_types=None) -> List[dict]:
+    """Shared/NA/Used on-demand filters; several instance types are sent as one ANY_OF filter."""
+    filters = []
+    if instance_types:
+        if len(instance_types) == 1:
+            filters.append({"Type":"TERM_MATCH","Field":"instanceType","Value":instance_types[0]})
+        else:
+            filters.append({"Type":"ANY_OF","Field":"instanceType","Value":",".join(instance_types)})
+    filters += [
+        {"Type":"TERM_MATCH","Field":"location","Value":location},
+        {"Type":"TERM_MATCH","Field":"operatingSystem","Value":os_name},
+    ]
+    filters += _EC2_BASE_FILTERS
+    return filters
+
+def _collect_prices_by_type(filters: List[dict], service_code: str = "AmazonEC2",
+                            page_size: int = 100) -> Dict[str, float]:
+    """{instanceType: hourly_usd} over every page of a get_products query (first hit per type wins)."""
+    prices: Dict[str, float] = {}
+    pages = _get_pricing_client().get_paginator("get_products").paginate(
+        ServiceCode=service_code, Filters=filters, PaginationConfig={"PageSize": page_size}
+    )
+    for page in pages:
+        for pl in page.get("PriceList", []):
+            o = _loads(pl)
+            itype = o.get("product", {}).get("attributes", {}).get("instanceType")
+            if not itype or itype in prices:
+                continue
+            usd = _pricing_first_usd(o)
+            if usd is not None:
+                prices[itype] = usd
+    return prices
+
+@functools.lru_cache(maxsize=4096)
 def price_ec2_ondemand(instance_type: str, region: str, os_name: str = "Linux") -> Optional[float]:
-    boto3 = _lazy_boto3()
     # ✅ normalize region (handles aliases like "aws govcloud us-west")
     region = normalize_region(region)
     location = AWS_REGION_TO_LOCATION.get(region)
     if not location: return None
-    pricing = boto3.client("pricing", region_name="us-east-1")
-    filters = [
-        {"Type":"TERM_MATCH","Field":"instanceType","Value":instance_type},
-        {"Type":"TERM_MATCH","Field":"location","Value":location},
-        {"Type":"TERM_MATCH","Field":"operatingSystem","Value":os_name},
-        {"Type":"TERM_MATCH","Field":"tenancy","Value":"Shared"},
-        {"Type":"TERM_MATCH","Field":"preInstalledSw","Value":"NA"},
-        {"Type":"TERM_MATCH","Field":"capacitystatus","Value":"Used"},
-    ]
-    resp = pricing.get_products(ServiceCode="AmazonEC2", Filters=filters, MaxResults=100)
-    for pl in resp.get("PriceList", []):
-        o = json.loads(pl)
-        usd = _pricing_first_usd(o)
-        if usd is not None: return usd
+    pricing = _get_pricing_client()
+    filters = _ec2_filters(location, os_name, [instance_type])
+    # Filters are narrow enough that page 1 nearly always has the answer; keep paging only if it doesn't.
+    pages = pricing.get_paginator("get_products").paginate(
+        ServiceCode="AmazonEC2", Filters=filters, PaginationConfig={"PageSize": 10}
+    )
+    for page in pages:
+        for pl in page.get("PriceList", []):
+            usd = _pricelist_first_usd(pl)
+            if usd is not None: return usd
     return None
 
+def price_ec2_batch(instance_types, region: str, os_name: str = "Linux") -> Dict[str, float]:
+    """Hourly prices for several instance types in one region/OS with a single ANY_OF query."""
+    location = AWS_REGION_TO_LOCATION.get(normalize_region(region))
+    types = sorted(set(instance_types))
+    if not location or not types:
+        return {}
+    return _collect_prices_by_type(_ec2_filters(location, os_name, types))
+
+# ---------- Local EC2 price index (one bulk pull per region/OS) ----------
+AWS_PRICE_INDEX_TTL_DAYS = float(os.getenv("AWS_PRICE_INDEX_TTL_DAYS", "7"))
+
+def _aws_price_index_path(region: str) -> Path:
+    return Path(f"prices/aws_ec2_index_{region}.json")
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    """Write text to a temp file beside path, then rename it over path, so concurrent runs never read a truncated file."""
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def build_price_index(region: str, os_name: str = "Linux", refresh: bool = False,
+                      ttl_days: float | None = None, fetch: bool = True) -> Dict[str, float]:
+    """
+    Return {instanceType: hourly_usd} for every Shared/NA/Used EC2 product in a region for one OS.
+    Pulled once via the paginated Price List API and cached in prices/aws_ec2_index_{region}.json
+    as {"<os>": {"ts": epoch, "prices": {...}}}. With fetch=False a missing/stale index returns {}.
+    """
+    region = normalize_region(region)
+    location = AWS_REGION_TO_LOCATION.get(region)
+    if not location:
+        return {}
+    ttl = AWS_PRICE_INDEX_TTL_DAYS if ttl_days is None else float(ttl_days)
+    os_key = os_name.strip().lower()
+    path = _aws_price_index_path(region)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    except Exception:
+        data = {}
+    hit = data.get(os_key)
+    if hit and not refresh and (time.time() - hit.get("ts", 0)) / 86400.0 <= ttl:
+        return hit.get("prices", {})
+    if not fetch:
+        return {}
+
+    prices = _collect_prices_by_type(_ec2_filters(location, os_name))
+
+    data[os_key] = {"ts": int(time.time()), "prices": prices}
+    try:
+        _write_text_atomic(path, json.dumps(data))
+    except Exception:
+        pass
+    return prices
+
+def _io_map(fn, items: list, max_workers: int) -> list:
+    """list(map(fn, items)) on a thread pool for network-bound fn; a single item runs inline (no pool to set up)."""
+    if len(items) < 2 or max_workers < 2:
+        return [fn(x) for x in items]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as ex:
+        return list(ex.map(fn, items))
+
+def prefetch_ec2_prices(keys, max_workers: int = 32) -> Dict[Tuple[str, str, str], Optional[float]]:
+    """
+    Price unique (instance_type, region, os) keys; returns {key: hourly_usd}.
+    Uses the local price index first, then one batched ANY_OF query per region/OS for types the
+    index lacks, and only falls back to per-type lookups if the batched query fails.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    _get_pricing_client()  # create the shared client before fanning out (boto3 session setup isn't thread-safe)
+    out: Dict[Tuple[str, str, str], Optional[float]] = {}
+    indexes: Dict[Tuple[str, str], Dict[str, float]] = {}
+    for itype, region, os_name in keys:
+        idx_key = (region, os_name)
+        if idx_key not in indexes:
+            try:
+                indexes[idx_key] = build_price_index(region, os_name)
+            except Exception:
+                indexes[idx_key] = {}
+        usd = indexes[idx_key].get(itype)
+        if usd is not None:
+            out[(itype, region, os_name)] = usd
+
+    # Types missing from the index (new since it was cached, or no index at all): one ANY_OF query per region/OS.
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for itype, region, os_name in keys:
+        if (itype, region, os_name) not in out:
+            groups.setdefault((region, os_name), []).append(itype)
+    for (region, os_name), types in groups.items():
+        try:
+            found = price_ec2_batch(types, region, os_name)
+        except Exception:
+            continue  # e.g. endpoint without ANY_OF support; handled per type below
+        for itype in types:
+            out[(itype, region, os_name)] = found.get(itype)
+
+    misses = [k for k in keys if k not in out]
+    if misses:
+        out.update(zip(misses, _io_map(lambda k: price_ec2_ondemand(k[0], k[1], os_name=k[2]), misses, max_workers)))
+    return out
+
+_RDS_NO_LICENSE_ENGINES = frozenset({"MySQL", "PostgreSQL", "MariaDB", "Aurora MySQL", "Aurora PostgreSQL"})
+_RDS_CANON_ENGINES = _RDS_NO_LICENSE_ENGINES | {"Oracle", "SQL Server"}
+
 def _canon_rds_engine(engine: str) -> str:
     """
     Map CSV-friendly / free-text DB engine strings to AWS Price List canonical names.
@@ -191,7 +531,7 @@ def _canon_rds_engine(engine: str) -> str:
     if "sql" in s and "server" in s:
         return "SQL Server"
     # If it already looks canonical, pass it through; otherwise leave as-is
-    if engine in {"MySQL","PostgreSQL","MariaDB","Oracle","SQL Server","Aurora MySQL","Aurora PostgreSQL"}:
+    if engine in _RDS_CANON_ENGINES:
         return engine
     return engine
 
@@ -222,7 +562,7 @@ def _canon_rds_engine(engine: str) -> str:
     if "sql" in s and "server" in s:
         return "SQL Server"
     # Already canonical? pass through.
-    if engine in {"MySQL","PostgreSQL","MariaDB","Oracle","SQL Server","Aurora MySQL","Aurora PostgreSQL"}:
+    if engine in _RDS_CANON_ENGINES:
         return engine
     return engine
 
@@ -234,7 +574,7 @@ def _normalize_rds_class(instance_class: str) -> str:
 
 def _license_model_for_rds(canon_engine: str, license_model: str | None) -> str | None:
     lm_in = (license_model or "").strip().lower()
-    if canon_engine in {"MySQL", "PostgreSQL", "MariaDB", "Aurora MySQL", "Aurora PostgreSQL"}:
+    if canon_engine in _RDS_NO_LICENSE_ENGINES:
         return "No license required"
     if canon_engine == "SQL Server":
         if lm_in == "byol":
@@ -284,6 +624,70 @@ def normalize_region(region: str) -> str:
         return r2
     return r  # fall through (let existing validators handle errors)
 
+@functools.lru_cache(maxsize=256)
+def _rds_price_table(location: str, canon_engine: str, dep: str, lm: str) -> Dict[str, float]:
+    """
+    {db instance class: hourly_usd} for one engine/deployment/license in a region, pulled with a
+    single paginated sweep (no instanceType filter) so every row sharing these values costs no extra calls.
+    Raises on API errors so a failure is not memoized.
+    """
+    filters = [
+        {"Type":"TERM_MATCH","Field":"location","Value":location},
+        {"Type":"TERM_MATCH","Field":"databaseEngine","Value":canon_engine},
+        {"Type":"TERM_MATCH","Field":"deploymentOption","Value":dep},
+        {"Type":"TERM_MATCH","Field":"licenseModel","Value":lm},
+    ]
+    return _collect_prices_by_type(filters, service_code="AmazonRDS")
+
+@functools.lru_cache(maxsize=4096)
+def _rds_price_lookup(location: str, canon_engine: str, ic_value: str, dep: str, lm: str) -> Optional[float]:
+    """One RDS get_products query on already-canonical filter values (memoized per process)."""
+    filters = [
+        {"Type":"TERM_MATCH","Field":"location","Value":location},
+        {"Type":"TERM_MATCH","Field":"databaseEngine","Value":canon_engine},
+        {"Type":"TERM_MATCH","Field":"instanceType","Value":ic_value},
+        {"Type":"TERM_MATCH","Field":"deploymentOption","Value":dep},
+        {"Type":"TERM_MATCH","Field":"licenseModel","Value":lm},
+    ]
+    resp = _get_pricing_client().get_products(ServiceCode="AmazonRDS", Filters=filters, MaxResults=100)
+    for pl in resp.get("PriceList", []):
+        try:
+            usd = _pricelist_first_usd(pl)
+        except Exception:
+            continue
+        if usd is not None:
+            return usd
+    return None
+
+def _rds_table_key(engine: str, region: str, license_model: str, multi_az: bool) -> Optional[Tuple[str, str, str, str]]:
+    """(location, canonical engine, deployment, licenseModel) as sent to the Price List API, or None if unpriceable."""
+    location = AWS_REGION_TO_LOCATION.get(normalize_region(region))
+    if not location:
+        return None
+    canon_engine = _canon_rds_engine(engine)
+    lm = _license_model_for_rds(canon_engine, license_model)
+    if lm is None:
+        return None  # e.g., SQL Server BYOL
+    return location, canon_engine, ("Multi-AZ" if multi_az else "Single-AZ"), lm
+
+def prefetch_rds_prices(keys, max_workers: int = 8) -> None:
+    """
+    Warm the RDS price tables for (engine, region, license_model, multi_az) keys concurrently, so the
+    per-row price_rds_ondemand calls that follow are served from memory. Failures are left for those calls to retry.
+    """
+    todo = list(dict.fromkeys(k for k in (_rds_table_key(*key) for key in keys) if k))
+    if not todo:
+        return
+    _get_pricing_client()  # create the shared client before fanning out (boto3 session setup isn't thread-safe)
+
+    def _warm(k):
+        try:
+            _rds_price_table(*k)
+        except Exception:
+            pass
+
+    _io_map(_warm, todo, max_workers)
+
 def price_rds_ondemand(
     engine: str,
     instance_class: str,
@@ -291,47 +695,25 @@ def price_rds_ondemand(
     license_model: str = "AWS",
     multi_az: bool = False
 ) -> Optional[float]:
-    boto3 = _lazy_boto3()
-    pricing = boto3.client("pricing", region_name="us-east-1")
-
-    region = normalize_region(region)
-    location = AWS_REGION_TO_LOCATION.get(region)
-    if not location:
+    key = _rds_table_key(engine, region, license_model, multi_az)
+    if key is None:
         return None
-
-    canon_engine = _canon_rds_engine(engine)
-    lm = _license_model_for_rds(canon_engine, license_model)
-    if lm is None:
-        return None  # e.g., SQL Server BYOL
+    location, canon_engine, dep, lm = key
 
     # pricing.py  (inside price_rds_ondemand)
     ic = _normalize_rds_class(instance_class)
     if not ic:
         return None
 
-    dep = "Multi-AZ" if multi_az else "Single-AZ"
-
     def _try(ic_value: str) -> Optional[float]:
-        filters = [
-            {"Type":"TERM_MATCH","Field":"location","Value":location},
-            {"Type":"TERM_MATCH","Field":"databaseEngine","Value":canon_engine},
-            {"Type":"TERM_MATCH","Field":"instanceType","Value":ic_value},
-            {"Type":"TERM_MATCH","Field":"deploymentOption","Value":dep},
-            {"Type":"TERM_MATCH","Field":"licenseModel","Value":lm},
-        ]
         try:
-            resp = pricing.get_products(ServiceCode="AmazonRDS", Filters=filters, MaxResults=100)
+            return _rds_price_table(location, canon_engine, dep, lm).get(ic_value)
         except Exception:
-            return None
-        for pl in resp.get("PriceList", []):
-            try:
-                o = json.loads(pl)
-            except Exception:
-                continue
-            usd = _pricing_first_usd(o)
-            if usd is not None:
-                return usd
-        return None
+            pass  # bulk sweep failed; fall back to a narrow per-class query
+        try:
+            return _rds_price_lookup(location, canon_engine, ic_value, dep, lm)
+        except Exception:
+            return None  # API errors are not memoized, so a later row can retry
 
     # Try the requested class first
     price = _try(ic)
@@ -375,6 +757,20 @@ def _load_override_json(path: Path):
     except Exception:
         return None
 
+@functools.lru_cache(maxsize=4)
+def _azure_sql_overrides_cached(path: str, mtime_ns: int) -> list:
+    data = _load_override_json(Path(path))
+    return data if isinstance(data, list) else []
+
+def _azure_sql_overrides() -> list:
+    """prices/azure_sql_prices.json rows, parsed once per file version (shared list: read-only)."""
+    p = Path("prices/azure_sql_prices.json")
+    try:
+        st = p.stat()
+    except OSError:
+        return []
+    return _azure_sql_overrides_cached(os.path.abspath(p), st.st_mtime_ns)
+
 def monthly_azure_sql_cost(
     deployment: str,           # "single" | "mi"
     region: str,
@@ -401,8 +797,8 @@ def monthly_azure_sql_cost(
     lic = (license_model or "LicenseIncluded").strip().upper()
 
     # --- 1) Overrides (optional) ---
-    overrides = _load_override_json(Path("prices/azure_sql_prices.json")) or []
-    if use_overrides and overrides:
+    overrides = _azure_sql_overrides() if use_overrides else []
+    if overrides:
         for r in overrides:
             if (str(r.get("deployment","")).lower() == dep and
                 str(r.get("region","")).strip().lower() == reg and
@@ -462,6 +858,9 @@ def _azure_cache_load(region: str) -> Dict[str, dict]:
             return {}
     return {}
 
+# Serialises read-modify-write of the per-region cache files when prices are fetched from threads
+_AZURE_CACHE_LOCK = threading.Lock()
+
 def _azure_cache_save(region: str, data: Dict[str, dict]) -> None:
     try:
         with open(_azure_cache_path(region), "w", encoding="utf-8") as f:
@@ -486,6 +885,7 @@ def _azure_fetch_retail_prices(region: str, sku_core: str, os_name: str, timeout
         f"skuName eq '{sku}' and "
         f"priceType eq 'Consumption'"
     )
+    import requests  # only the Azure Retail Prices path needs it; keeps it out of CLI startup
     url = f"{base}?$filter={requests.utils.quote(filt, safe=' =\'')}"
     best_linux = None
     best_windows = None
@@ -535,8 +935,11 @@ def _azure_live_compute_hourly(region: str, sku: str, os_name: str, refresh: boo
     price = _azure_fetch_retail_prices(region, sku_core, os_name)
     if price is None:
         return None
-    cache[key] = {"price": float(price), "ts": int(time.time())}
-    _azure_cache_save(region, cache)
+    with _AZURE_CACHE_LOCK:
+        # Re-read so entries saved by other threads since our load aren't dropped
+        cache = _azure_cache_load(region) if cache_ok else cache
+        cache[key] = {"price": float(price), "ts": int(time.time())}
+        _azure_cache_save(region, cache)
     return float(price)
 
 def _azure_price_override(region: str, sku: str, os_name: str, license_model: str) -> Optional[float]:
@@ -576,13 +979,35 @@ def azure_vm_price_hourly(region: str, sku: str, os_name: str, license_model: st
         uplift += 0.01
     return _AZ_BASE_DEFAULT_HOURLY + uplift
 
+def prefetch_azure_vm_prices(keys, refresh=False, max_workers: int = 8) -> Dict[Tuple[str, str, str, str], float]:
+    """
+    Price unique (region, sku, os, license_model) keys concurrently; returns {key: hourly_usd}.
+    Cache misses each cost a Retail Prices API round trip, so they overlap instead of running back to back.
+    Keys whose lookup raises are left out for the caller to retry.
+    """
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+
+    def _one(k):
+        try:
+            return azure_vm_price_hourly(*k, refresh=refresh)
+        except Exception:
+            return None
+
+    return {k: v for k, v in zip(keys, _io_map(_one, keys, max_workers)) if v is not None}
+
 # ---------- Monthly calculators ----------
 def monthly_compute_cost(price_per_hour: Optional[float], hours: float) -> float:
     return round((price_per_hour or 0.0) * hours, 2)
 
+_EBS_GB_MONTH = {"gp3": EBS_GP3_GB_MONTH, "io1": EBS_IO1_GB_MONTH}
+
 def monthly_ebs_cost(ebs_gb: float, ebs_type: str = "gp3") -> float:
-    et = (ebs_type or "gp3").strip().lower()
-    rate = EBS_IO1_GB_MONTH if et == "io1" else EBS_GP3_GB_MONTH
+    rate = _EBS_GB_MONTH.get(ebs_type)  # already-normalised type: no string work
+    if rate is None:
+        et = (ebs_type or "gp3").strip().lower()
+        rate = EBS_IO1_GB_MONTH if et == "io1" else EBS_GP3_GB_MONTH
     return round(max(0.0, ebs_gb) * rate, 2)
 
 def monthly_s3_cost(s3_gb: float) -> float:
@@ -590,10 +1015,30 @@ def monthly_s3_cost(s3_gb: float) -> float:
 
 def monthly_network_cost(profile: str) -> float:
     if not profile: return 0.0
-    gb = NETWORK_PROFILE_TO_GB.get(profile.strip().lower())
+    gb = NETWORK_PROFILE_TO_GB.get(profile)
+    if gb is None:
+        gb = NETWORK_PROFILE_TO_GB.get(profile.strip().lower())
     if gb is None: return 0.0
     return round(gb * DTO_GB_PRICE, 2)
 
+def monthly_storage_network_costs(ebs_gb: List[float], ebs_type: List[str], s3_gb: List[float],
+                                  network_profile: List[str]) -> Tuple[List[float], List[float], List[float]]:
+    """
+    monthly_ebs_cost / monthly_s3_cost / monthly_network_cost for whole columns at once (types and
+    profiles already stripped and lowercased). The arithmetic runs in NumPy; rounding stays Python's
+    round() so every value matches the scalar helpers exactly.
+    """
+    import numpy as np
+    ebs = np.asarray(ebs_gb, dtype=np.float64)
+    s3 = np.asarray(s3_gb, dtype=np.float64)
+    ebs_rate = np.where(np.asarray(ebs_type, dtype=object) == "io1", EBS_IO1_GB_MONTH, EBS_GP3_GB_MONTH)
+    net_gb = np.array([NETWORK_PROFILE_TO_GB.get(p, 0.0) if p else 0.0 for p in network_profile], dtype=np.float64)
+    ebs_m = np.where(ebs > 0.0, ebs, 0.0) * ebs_rate
+    s3_m = np.where(s3 > 0.0, s3, 0.0) * S3_STD_GB_MONTH
+    net_m = net_gb * DTO_GB_PRICE
+    return ([round(v, 2) for v in ebs_m.tolist()], [round(v, 2) for v in s3_m.tolist()],
+            [round(v, 2) for v in net_m.tolist()])
+
 def monthly_rds_cost(engine: str, instance_class: str, region: str, license_model: str, multi_az: bool, hours: float) -> float:
     p = price_rds_ondemand(engine, instance_class, region, license_model=license_model, multi_az=multi_az)
     return round((p or 0.0) * hours, 2)
@@ -1,7 +1,9 @@
 # recommender.py
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from pathlib import Path
-import json, os, sys
+import json, os, sys, time, functools, tempfile
+
+import numpy as np
 
 # ---------- AWS sizing ----------
 FAMILY_PREFS = {
@@ -9,6 +11,8 @@ FAMILY_PREFS = {
     "compute":  ["c7i", "c6i", "c5"],
     "memory":   ["r7i", "r6i", "r5"],
 }
+# {profile: {family: preference rank}}; anything not listed ranks after the preferred families.
+FAMILY_RANK = {p: {f: i for i, f in enumerate(fs)} for p, fs in FAMILY_PREFS.items()}
 
 _AZ_REGION_NORMALIZE = {
     "east us": "eastus", "eastus": "eastus",
@@ -30,61 +34,331 @@ def infer_profile(vcpu: int, mem_gib: float) -> str:
     if mem_per_vcpu >= 6.0: return "memory"
     return "balanced"
 
+_BOTO3 = None
+
 def _lazy_boto3():
+    global _BOTO3
+    if _BOTO3 is None:
+        try:
+            import boto3  # type: ignore
+        except ImportError:
+            print("This feature requires boto3. Install with: pip install boto3", file=sys.stderr)
+            sys.exit(1)
+        _BOTO3 = boto3
+    return _BOTO3
+
+@functools.lru_cache(maxsize=None)
+def _get_ec2_client(region: str):
+    """One EC2 client per region, with a larger connection pool and TCP keepalive."""
+    boto3 = _lazy_boto3()
+    from botocore.config import Config
+    cfg = Config(
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=5,
+        read_timeout=30,
+        retries={"mode": "adaptive", "max_attempts": 5},
+    )
+    return boto3.client("ec2", region_name=region, config=cfg)
+
+AWS_CATALOG_TTL_DAYS = float(os.getenv("AWS_CATALOG_TTL_DAYS", "7"))
+
+def _lazy_feather():
+    # Optional: with pyarrow installed the catalog cache is a Feather file (columnar, fast to load).
     try:
-        import boto3  # type: ignore
-        return boto3
+        import pyarrow as pa  # type: ignore
+        import pyarrow.feather as feather  # type: ignore
+        return pa, feather
     except ImportError:
-        print("This feature requires boto3. Install with: pip install boto3", file=sys.stderr)
-        sys.exit(1)
+        return None
 
-def fetch_instance_catalog(region: str) -> Dict[str, dict]:
-    boto3 = _lazy_boto3()
-    ec2 = boto3.client("ec2", region_name=region)
-    paginator = ec2.get_paginator("describe_instance_types")
-    page_it = paginator.paginate(Filters=[{"Name":"current-generation","Values":["true"]}])
-
-    catalog = {}
-    for page in page_it:
-        for it in page.get("InstanceTypes", []):
-            itype = it["InstanceType"]
-            if itype.endswith(".metal"): continue
-            archs = it.get("ProcessorInfo", {}).get("SupportedArchitectures", [])
-            if "x86_64" not in archs: continue
-            vcpu = it.get("VCpuInfo", {}).get("DefaultVCpus", 0)
-            mem_mib = it.get("MemoryInfo", {}).get("SizeInMiB", 0)
-            if vcpu <= 0 or mem_mib <= 0: continue
-            catalog[itype] = {"instanceType": itype, "vcpu": vcpu, "memory_gib": mem_mib/1024.0}
-    return catalog
+def _write_atomic(path: Path, write) -> None:
+    """
+    write(tmp_path) into a temp file beside path, then rename it over path, so a concurrent
+    or interrupted run never sees (or leaves) a half-written cache file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _dump_json(obj, **kw):
+    def write(tmp):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, **kw)
+    return write
+
+def _aws_catalog_cache_path(region: str, suffix: str = ".json") -> Path:
+    Path("cache").mkdir(exist_ok=True)
+    return Path(f"cache/aws_instance_types_{region}{suffix}")
+
+def _aws_load_cached_catalog(region: str, ttl_days: float) -> Optional[Dict[str, dict]]:
+    fa = _lazy_feather()
+    for suffix in ((".feather", ".json") if fa else (".json",)):
+        p = _aws_catalog_cache_path(region, suffix)
+        try:
+            if (time.time() - p.stat().st_mtime) / 86400.0 > ttl_days:
+                continue
+            if suffix == ".feather":
+                cols = fa[1].read_table(p).to_pydict()
+                catalog = {
+                    t: {"instanceType": t, "vcpu": int(v), "memory_gib": float(m)}
+                    for t, v, m in zip(cols["instanceType"], cols["vcpu"], cols["memory_gib"])
+                }
+            else:
+                with open(p, "r", encoding="utf-8") as f:
+                    catalog = json.load(f)
+            if catalog:
+                return catalog
+        except Exception:
+            continue
+    return None
 
-def _family_rank(families: List[str], itype: str) -> int:
-    fam = itype.split(".")[0]
+def _aws_save_cached_catalog(region: str, catalog: Dict[str, dict]):
+    fa = _lazy_feather()
     try:
-        return families.index(fam)
-    except ValueError:
-        return len(families) + 1
-
-def pick_instance(catalog: Dict[str, dict], profile: str, need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
-    families = FAMILY_PREFS.get(profile, FAMILY_PREFS["balanced"])
-    candidates = [t for t, info in catalog.items() if info["vcpu"] >= need_vcpu and info["memory_gib"] >= need_mem_gib]
-    if not candidates: return None
-    def sort_key(itype: str) -> Tuple[int,int,float,str]:
-        info = catalog[itype]
-        return (_family_rank(families, itype), info["vcpu"], info["memory_gib"], itype)
-    candidates.sort(key=sort_key)
-    return catalog[candidates[0]]
-
-def smallest_meeting_cpu(catalog: Dict[str, dict], vcpu_needed: int) -> Optional[dict]:
-    fits = [info for info in catalog.values() if info["vcpu"] >= vcpu_needed]
-    if not fits: return None
-    fits.sort(key=lambda x: (x["vcpu"], x["memory_gib"], x["instanceType"]))
-    return fits[0]
-
-def smallest_meeting_mem(catalog: Dict[str, dict], mem_needed: float) -> Optional[dict]:
-    fits = [info for info in catalog.values() if info["memory_gib"] >= mem_needed]
-    if not fits: return None
-    fits.sort(key=lambda x: (x["memory_gib"], x["vcpu"], x["instanceType"]))
-    return fits[0]
+        if fa:
+            pa, feather = fa
+            infos = list(catalog.values())
+            table = pa.table({
+                "instanceType": [i["instanceType"] for i in infos],
+                "vcpu": pa.array([i["vcpu"] for i in infos], type=pa.int32()),
+                "memory_gib": pa.array([i["memory_gib"] for i in infos], type=pa.float64()),
+            })
+            _write_atomic(_aws_catalog_cache_path(region, ".feather"),
+                          lambda tmp: feather.write_feather(table, tmp, compression="zstd"))
+        else:
+            _write_atomic(_aws_catalog_cache_path(region), _dump_json(catalog))
+    except Exception:
+        pass
+
+def fetch_instance_catalog(region: str, refresh: bool = False, ttl_days: Optional[float] = None) -> Dict[str, dict]:
+    """
+    Current-gen x86_64 instance types for a region. Served from cache/aws_instance_types_{region}.feather
+    (pyarrow installed) or .json while younger than AWS_CATALOG_TTL_DAYS; refresh=True forces a new
+    describe_instance_types pass.
+    """
+    if not refresh:
+        cached = _aws_load_cached_catalog(region, AWS_CATALOG_TTL_DAYS if ttl_days is None else float(ttl_days))
+        if cached:
+            return cached
+    catalog = _fetch_instance_catalog_live(region)
+    if catalog:
+        _aws_save_cached_catalog(region, catalog)
+    return catalog
+
+def _fetch_instance_catalog_live(region: str) -> Dict[str, dict]:
+    ec2 = _get_ec2_client(region)
+    paginator = ec2.get_paginator("describe_instance_types")
+    # Let EC2 drop old-gen and non-x86_64 types instead of paging them down to discard here.
+    # Metal is filtered by name below: "bare-metal=false" would also drop sized metal (m7i.metal-24xl).
+    page_it = paginator.paginate(Filters=[
+        {"Name":"current-generation","Values":["true"]},
+        {"Name":"processor-info.supported-architecture","Values":["x86_64"]},
+    ])
+
+    specs = (
+        (it["InstanceType"], it.get("VCpuInfo", {}).get("DefaultVCpus", 0), it.get("MemoryInfo", {}).get("SizeInMiB", 0))
+        for page in page_it for it in page.get("InstanceTypes", [])
+    )
+    return {
+        itype: {"instanceType": itype, "vcpu": vcpu, "memory_gib": mem_mib/1024.0}
+        for itype, vcpu, mem_mib in specs
+        if vcpu > 0 and mem_mib > 0 and not itype.endswith(".metal")
+    }
+
+def _family_rank(rank_map: Dict[str, int], itype: str) -> int:
+    return rank_map.get(itype.partition(".")[0], len(rank_map) + 1)
+
+class CatalogArrays:
+    """
+    Structure-of-arrays view of an instance catalog ({itype: {"instanceType","vcpu","memory_gib"}}).
+    Build once per region and pass to pick_instance / smallest_meeting_* instead of the dict.
+    """
+    def __init__(self, catalog: Dict[str, dict]):
+        self.catalog = catalog
+        self.types = np.array(list(catalog), dtype=str)
+        self.vcpu = np.array([catalog[t]["vcpu"] for t in catalog], dtype=np.int64)
+        self.mem = np.array([catalog[t]["memory_gib"] for t in catalog], dtype=np.float64)
+        self._ranks: Dict[str, np.ndarray] = {}
+        self._axes: Dict[str, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def fam_rank(self, profile: str) -> np.ndarray:
+        key = profile if profile in FAMILY_RANK else "balanced"
+        if key not in self._ranks:
+            rank_map = FAMILY_RANK[key]
+            self._ranks[key] = np.array([_family_rank(rank_map, t) for t in self.types], dtype=np.int64)
+        return self._ranks[key]
+
+    def first(self, mask: np.ndarray, *keys: np.ndarray) -> Optional[dict]:
+        """
+        Catalog entry for the smallest masked row ordered by keys (primary first), ties by name.
+        Lexicographic argmin: narrow to the rows holding each key's minimum, no sort needed.
+        """
+        idx = np.flatnonzero(mask)
+        if idx.size == 0:
+            return None
+        for k in keys:
+            if idx.size == 1:
+                break
+            vals = k[idx]
+            idx = idx[vals == vals.min()]
+        best = idx[np.argmin(self.types[idx])] if idx.size > 1 else idx[0]
+        return self.catalog[str(self.types[best])]
+
+    def _sorted_axis(self, name: str, primary: np.ndarray, secondary: np.ndarray):
+        """(primary values in sorted order, row order) for (primary, secondary, name); built once."""
+        if name not in self._axes:
+            order = np.lexsort((self.types, secondary, primary))
+            self._axes[name] = (primary[order], order)
+        return self._axes[name]
+
+    def smallest_at_least(self, axis: str, need: float) -> Optional[dict]:
+        """Smallest entry with vcpu (axis="vcpu") or memory (axis="mem") >= need, via binary search."""
+        if axis == "vcpu":
+            keys, order = self._sorted_axis("vcpu", self.vcpu, self.mem)
+        else:
+            keys, order = self._sorted_axis("mem", self.mem, self.vcpu)
+        i = int(np.searchsorted(keys, need, side="left"))
+        if i >= len(order):
+            return None
+        return self.catalog[str(self.types[order[i]])]
+
+    # Rows per block in the batch pickers; bounds the (rows x catalog) fit matrix to a few MB.
+    _BLOCK = 4096
+
+    def pick_many(self, profile: str, need_vcpu: np.ndarray, need_mem: np.ndarray) -> np.ndarray:
+        """
+        Row index of pick_instance's answer for every (need_vcpu[i], need_mem[i]), -1 where nothing fits.
+        Rows are ordered once by (family rank, vcpu, mem, name); each request's winner is the first fitting row.
+        """
+        key = "pick:" + (profile if profile in FAMILY_RANK else "balanced")
+        if key not in self._axes:
+            order = np.lexsort((self.types, self.mem, self.vcpu, self.fam_rank(profile)))
+            self._axes[key] = (self.vcpu[order], self.mem[order], order)
+        return self._first_fit_many(key, need_vcpu, need_mem)
+
+    def smallest_fit_many(self, need_vcpu: np.ndarray, need_mem: np.ndarray) -> np.ndarray:
+        """pick_many without family preference: smallest fitting row by (vcpu, mem, name)."""
+        if "fit" not in self._axes:
+            order = np.lexsort((self.types, self.mem, self.vcpu))
+            self._axes["fit"] = (self.vcpu[order], self.mem[order], order)
+        return self._first_fit_many("fit", need_vcpu, need_mem)
+
+    def _first_fit_many(self, key: str, need_vcpu: np.ndarray, need_mem: np.ndarray) -> np.ndarray:
+        vcpu, mem, order = self._axes[key]
+        need_vcpu = np.asarray(need_vcpu, dtype=np.float64)
+        need_mem = np.asarray(need_mem, dtype=np.float64)
+        out = np.full(need_vcpu.shape[0], -1, dtype=np.int64)
+        if not len(order):
+            return out
+        kernel = _lazy_first_fit_kernel() if need_vcpu.shape[0] >= _NUMBA_MIN_ROWS else None
+        if kernel is not None:
+            kernel(need_vcpu, need_mem, vcpu, mem, order, out)
+            return out
+        for lo in range(0, need_vcpu.shape[0], self._BLOCK):
+            hi = lo + self._BLOCK
+            fits = (vcpu >= need_vcpu[lo:hi, None]) & (mem >= need_mem[lo:hi, None])
+            first = fits.argmax(axis=1)
+            hit = fits[np.arange(first.shape[0]), first]
+            out[lo:hi] = np.where(hit, order[first], -1)
+        return out
+
+    def smallest_at_least_many(self, axis: str, needs: np.ndarray) -> np.ndarray:
+        """Vectorised smallest_at_least: row index per need (-1 where nothing is large enough)."""
+        if axis == "vcpu":
+            keys, order = self._sorted_axis("vcpu", self.vcpu, self.mem)
+        else:
+            keys, order = self._sorted_axis("mem", self.mem, self.vcpu)
+        needs = np.asarray(needs, dtype=np.float64)
+        n = len(order)
+        if not n:
+            return np.full(needs.shape[0], -1, dtype=np.int64)
+        i = np.searchsorted(keys, needs, side="left")
+        return np.where(i < n, order[np.minimum(i, n - 1)], -1)
+
+    def entries(self, idx: np.ndarray) -> List[Optional[dict]]:
+        """Catalog dicts for row indices from the *_many methods (None for -1)."""
+        return [self.catalog[str(self.types[i])] if i >= 0 else None for i in idx.tolist()]
+
+_NUMBA_MIN_ROWS = int(os.getenv("RECOMMENDER_NUMBA_MIN_ROWS", "20000"))
+_FIRST_FIT_KERNEL = None  # compiled on first use; False when numba is unavailable
+
+def _lazy_first_fit_kernel():
+    # Optional: pip install numba to scan the sorted catalog per request without the block fit matrices.
+    global _FIRST_FIT_KERNEL
+    if _FIRST_FIT_KERNEL is None:
+        try:
+            from numba import njit, prange  # type: ignore
+        except Exception:
+            _FIRST_FIT_KERNEL = False
+            return None
+
+        @njit(cache=True, parallel=True)
+        def _first_fit(need_vcpu, need_mem, vcpu, mem, order, out):
+            for i in prange(need_vcpu.shape[0]):
+                nv = need_vcpu[i]
+                nm = need_mem[i]
+                for j in range(vcpu.shape[0]):
+                    if vcpu[j] >= nv and mem[j] >= nm:
+                        out[i] = order[j]
+                        break
+
+        _FIRST_FIT_KERNEL = _first_fit
+    return _FIRST_FIT_KERNEL or None
+
+def catalog_arrays(catalog) -> CatalogArrays:
+    return catalog if isinstance(catalog, CatalogArrays) else CatalogArrays(catalog)
+
+def _make_picker(profile: str):
+    """pick_instance specialised for one profile (its family ranking is resolved once, here)."""
+    def pick(catalog, need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
+        arr = catalog_arrays(catalog)
+        mask = (arr.vcpu >= need_vcpu) & (arr.mem >= need_mem_gib)
+        return arr.first(mask, arr.fam_rank(profile), arr.vcpu, arr.mem)
+    pick.__name__ = f"pick_{profile}"
+    return pick
+
+PICKERS = {p: _make_picker(p) for p in FAMILY_PREFS}
+
+def pick_instance(catalog, profile: str, need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
+    return PICKERS.get(profile, PICKERS["balanced"])(catalog, need_vcpu, need_mem_gib)
+
+def pick_instances(catalog, profiles: List[str], need_vcpu, need_mem_gib) -> List[Optional[dict]]:
+    """pick_instance for many requests at once: one vectorised pass per distinct profile."""
+    arr = catalog_arrays(catalog)
+    need_vcpu = np.asarray(need_vcpu, dtype=np.float64)
+    need_mem_gib = np.asarray(need_mem_gib, dtype=np.float64)
+    profiles = np.asarray(profiles, dtype=object)
+    idx = np.full(len(profiles), -1, dtype=np.int64)
+    for prof in dict.fromkeys(profiles.tolist()):
+        sel = np.flatnonzero(profiles == prof)
+        idx[sel] = arr.pick_many(prof, need_vcpu[sel], need_mem_gib[sel])
+    return arr.entries(idx)
+
+def smallest_meeting_cpu_many(catalog, vcpu_needed) -> List[Optional[dict]]:
+    arr = catalog_arrays(catalog)
+    return arr.entries(arr.smallest_at_least_many("vcpu", vcpu_needed))
+
+def smallest_meeting_mem_many(catalog, mem_needed) -> List[Optional[dict]]:
+    arr = catalog_arrays(catalog)
+    return arr.entries(arr.smallest_at_least_many("mem", mem_needed))
+
+def smallest_meeting_cpu(catalog, vcpu_needed: int) -> Optional[dict]:
+    return catalog_arrays(catalog).smallest_at_least("vcpu", vcpu_needed)
+
+def smallest_meeting_mem(catalog, mem_needed: float) -> Optional[dict]:
+    return catalog_arrays(catalog).smallest_at_least("mem", mem_needed)
 
 # ---------- Azure sizing (dynamic via SDK/CLI with cache) ----------
 def _azure_list_vm_sizes_via_sdk(region: str):
@@ -213,28 +487,52 @@ def _azure_load_cached_sizes(region: str):
 
 def _azure_save_cached_sizes(region: str, sizes: List[dict]):
     try:
-        with open(_azure_catalog_cache_path(region), "w", encoding="utf-8") as f:
-            json.dump(sizes, f, indent=2)
+        _write_atomic(_azure_catalog_cache_path(region), _dump_json(sizes, indent=2))
     except Exception:
         pass
 
-def fetch_azure_vm_catalog(region: str) -> Dict[str, dict]:
-    sizes = _azure_list_vm_sizes_via_sdk(region) or _azure_list_vm_sizes_via_cli(region) or _azure_load_cached_sizes(region)
+AZURE_CATALOG_TTL_DAYS = float(os.getenv("AZURE_CATALOG_TTL_DAYS", "1"))
+
+def _azure_cache_fresh(region: str, ttl_days: float) -> bool:
+    try:
+        return (time.time() - _azure_catalog_cache_path(region).stat().st_mtime) / 86400.0 <= ttl_days
+    except OSError:
+        return False
+
+def fetch_azure_vm_catalog(region: str, refresh: bool = False, ttl_days: Optional[float] = None) -> Dict[str, dict]:
+    """
+    VM sizes for a region. A cache/azure_vm_sizes_{region}.json younger than AZURE_CATALOG_TTL_DAYS
+    is used as-is (no SDK/CLI call); otherwise SDK, then CLI, then the stale cache.
+    """
+    ttl = AZURE_CATALOG_TTL_DAYS if ttl_days is None else float(ttl_days)
+    sizes = None
+    if not refresh and _azure_cache_fresh(region, ttl):
+        sizes = _azure_load_cached_sizes(region)
+    fetched = False
+    if not sizes:
+        sizes = _azure_list_vm_sizes_via_sdk(region) or _azure_list_vm_sizes_via_cli(region)
+        fetched = bool(sizes)
+    if not sizes:
+        sizes = _azure_load_cached_sizes(region)
     if not sizes:
         raise SystemExit(
             f"Azure VM sizes unavailable for region '{region}'. "
             "Install 'azure-identity azure-mgmt-compute' or Azure CLI and login, or provide a cached file under ./cache."
         )
-    # cache if fetched fresh
-    if sizes and not _azure_load_cached_sizes(region):
+    # live results refresh the cache (and its TTL)
+    if fetched:
         _azure_save_cached_sizes(region, sizes)
     catalog = { s["name"]: {"instanceType": s["name"], "vcpu": s["vcpu"], "memory_gib": s["memory_gib"]} for s in sizes }
     return catalog
 
-def pick_azure_size(catalog: Dict[str, dict], need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
-    candidates = [info for info in catalog.values() if info["vcpu"] >= need_vcpu and info["memory_gib"] >= need_mem_gib]
-    if not candidates:
-        return None
-    candidates.sort(key=lambda x: (x["vcpu"], x["memory_gib"], x["instanceType"]))
-    return candidates[0]
+def pick_azure_size(catalog, need_vcpu: int, need_mem_gib: float) -> Optional[dict]:
+    """Smallest size by (vcpu, memory, name) that fits; catalog may be a dict or CatalogArrays."""
+    arr = catalog_arrays(catalog)
+    mask = (arr.vcpu >= need_vcpu) & (arr.mem >= need_mem_gib)
+    return arr.first(mask, arr.vcpu, arr.mem)
+
+def pick_azure_sizes(catalog, need_vcpu, need_mem_gib) -> List[Optional[dict]]:
+    """pick_azure_size for many requests at once (one vectorised pass)."""
+    arr = catalog_arrays(catalog)
+    return arr.entries(arr.smallest_fit_many(need_vcpu, need_mem_gib))
 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The CLI modules live at the repo root (no package); make them importable from tests/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,20 @@
+import csv
+
+import pytest
+
+import pricing
+
+
+def _dictreader_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("bom", ["", "\ufeff"])
+def test_pyarrow_rows_match_dictreader(tmp_path, bom):
+    pytest.importorskip("pyarrow")
+    p = tmp_path / "in.csv"
+    p.write_text(bom + 'id,name,vcpu\n007,"web, 1",2\n008,,\n', encoding="utf-8")
+    rows = pricing._read_csv_pyarrow(p)
+    assert rows == _dictreader_rows(p)
+    assert rows[0][bom + "id"] == "007"
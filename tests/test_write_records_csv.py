@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from main import _write_records_csv
+
+
+def _pandas_bytes(tmp_path, records):
+    ref = tmp_path / "ref.csv"
+    pd.DataFrame(records).to_csv(ref, index=False)
+    return ref.read_bytes()
+
+
+def test_plain_records_match_pandas(tmp_path):
+    records = [
+        {"id": 1, "vcpu": 2, "memory_gib": 8.0, "note": "ok"},
+        {"id": 2, "vcpu": None, "memory_gib": float("nan"), "extra": "x"},
+        {"id": 3, "vcpu": np.int64(4), "memory_gib": np.float64(16.5), "note": ""},
+    ]
+    out = tmp_path / "out.csv"
+    _write_records_csv(out, records)
+    assert out.read_bytes() == _pandas_bytes(tmp_path, records)
+
+
+def test_timestamp_and_missing_scalars_match_pandas(tmp_path):
+    # Excel input reaches recommend results through itertuples: dates as Timestamp, blanks as NaT / pd.NA
+    records = [
+        {"id": 1, "go_live": pd.Timestamp("2024-01-01"), "owner": "ops", "count": 2},
+        {"id": 2, "go_live": pd.NaT, "owner": pd.NA, "count": 3},
+    ]
+    out = tmp_path / "out.csv"
+    _write_records_csv(out, records)
+    data = out.read_bytes()
+    assert data == _pandas_bytes(tmp_path, records)
+    assert b"2024-01-01 00:00:00" not in data and b"NaT" not in data and b"<NA>" not in data
@@ -274,8 +274,9 @@ def validate_dataframe(df, input_file: str) -> Tuple[List[int], List[int], List[
     """
     ok_idx, rec_only_idx, error_idx = [], [], []
     report = []
-    for i, row in df.iterrows():
-        res = validate_row(row.to_dict())
+    # Plain dicts straight from the columns; iterrows() would build a Series per row
+    for i, row in zip(df.index.tolist(), df.to_dict(orient="records")):
+        res = validate_row(row)
         if res.status == "ok":
             ok_idx.append(i)
         elif res.status == "rec_only":